@@ -24,8 +24,8 @@ __version__ = "1.4.1"
 
 def create_app(app=None, config_map=None, register_browser=True):
     from .application import init_app
-    from .cache import cache
-    from .config import EnvAppSettings
+    from .cache import cache, validate_cache_config
+    from .config import load_env_config
     from .database import db
     from .tasks import init_tasks
 
@@ -34,12 +34,12 @@ def create_app(app=None, config_map=None, register_browser=True):
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['CACHE_TYPE'] = 'NullCache'
 
-    app.config.from_prefixed_env()
-    app.config.from_object(EnvAppSettings.from_env())
+    load_env_config(app)
     app.config.from_envvar('CANCELCHAIN_SETTINGS', silent=True)
     if config_map:
         app.config.from_mapping(config_map)
 
+    validate_cache_config(app)
     init_app(app, register_browser=register_browser)
 
     try:
@@ -52,10 +52,8 @@ def create_app(app=None, config_map=None, register_browser=True):
     except Exception as e:
         app.logger.error(e)
 
-    try:
+    if app.config.get('CELERY_BROKER_URL'):
         init_tasks(app)
-    except Exception as e:
-        app.logger.error(e)
 
     @app.shell_context_processor
     def make_shell_context():
@@ -1,15 +1,28 @@
-import json
+import hashlib
+import hmac
 import re
+import secrets
 from enum import Enum
-from functools import wraps
-from urllib.parse import urljoin
+from functools import lru_cache, wraps
 
 import jwt
-from flask import Blueprint, abort, current_app, make_response, request
+import orjson
+from celery import group
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    g,
+    has_request_context,
+    make_response,
+    request,
+)
 from flask.views import MethodView
+from jwt.utils import base64url_decode
 from marshmallow import Schema, ValidationError, fields, validate
 
-from cancelchain.api_client import PEER_HOST_HEADER, ApiClient
+from cancelchain.api_client import PEER_HOST_HEADER
 from cancelchain.block import TXN_TIMEOUT, Block
 from cancelchain.cache import cache
 from cancelchain.exceptions import CCError, EmptyChainError, MissingBlockError
@@ -19,23 +32,32 @@ from cancelchain.payload import encode_subject, validate_raw_subject
 from cancelchain.schema import validate_address_format, validate_public_key
 from cancelchain.signals import http_post as http_post_signal
 from cancelchain.tasks import post_process
-from cancelchain.util import ciso_2_dt, dt_2_ciso, host_address, now, now_iso
+from cancelchain.util import ciso_2_dt, dt_2_ciso, now, now_iso
 from cancelchain.wallet import Wallet
 
 API_TOKEN_SECONDS = 60 * 60 * 4
+TOKEN_CACHE_SIZE = 4096
 
 blueprint = Blueprint('api', __name__)
 
 
 def node_lc_dao():
-    node = Node(
-        host=current_app.config['NODE_HOST'],
-        peers=current_app.config['PEERS'],
-        clients=current_app.clients,
-        logger=current_app.logger
-    )
-    lc = node.longest_chain
-    return node, lc, lc.to_dao() if lc is not None else None
+    if 'node_lc_dao' not in g:
+        node = Node(
+            host=current_app.config['NODE_HOST'],
+            peers=current_app.config['PEERS'],
+            clients=current_app.clients,
+            logger=current_app.logger
+        )
+        lc = node.longest_chain
+        g.node_lc_dao = node, lc, lc.to_dao() if lc is not None else None
+    return g.node_lc_dao
+
+
+@blueprint.teardown_request
+def clear_request_state(exc):
+    g.pop('node_lc_dao', None)
+    g.pop('identity', None)
 
 
 def visited_hosts():
@@ -46,13 +68,12 @@ def visited_hosts():
 
 
 def queue_post_process(path, data, visited_hosts):
-    host, address = host_address(current_app.config['NODE_HOST'])
-    wallet = current_app.wallets.get(address)
+    client = current_app.node_client
     headers = None
     if visited_hosts:
         headers = {PEER_HOST_HEADER: ','.join(visited_hosts)}
-    headers = ApiClient(host, wallet).auth_header(headers=headers)
-    url = urljoin(host, path)
+    headers = client.auth_header(headers=headers)
+    url = client.url(path)
     http_post_signal.send(
         current_app._get_current_object(), url=url, data=data, headers=headers
     )
@@ -76,7 +97,33 @@ def queue_txn_post_process(txn, visited_hosts):
 
 def handle_http_post(sender, url=None, data=None, headers=None):
     if current_app.config.get('CELERY_BROKER_URL'):
-        post_process.delay(url, data, headers=headers)
+        if has_request_context():
+            g.setdefault('http_posts', []).append((url, data, headers))
+        else:
+            post_process.apply_async(
+                (url, data), {'headers': headers},
+                queue=current_app.config.get('PROPAGATION_QUEUE')
+            )
+
+
+@blueprint.teardown_request
+def flush_http_posts(exc):
+    if not (http_posts := g.pop('http_posts', None)):
+        return
+    queue = current_app.config.get('PROPAGATION_QUEUE')
+    try:
+        if len(http_posts) == 1:
+            url, data, headers = http_posts[0]
+            post_process.apply_async(
+                (url, data), {'headers': headers}, queue=queue
+            )
+        else:
+            group([
+                post_process.s(url, data, headers=headers)
+                for url, data, headers in http_posts
+            ]).apply_async(queue=queue)
+    except Exception as e:
+        current_app.logger.exception(e)
 
 
 @blueprint.record
@@ -84,14 +131,31 @@ def connect_signals(state):
     http_post_signal.connect(handle_http_post)
 
 
-def make_json_response(json_data, status_code=200):
-    if not isinstance(json_data, (str, bytes)):
-        json_data = json.dumps(json_data)
-    response = make_response(json_data, status_code)
-    response.headers['Content-Type'] = 'application/json'
+def make_json_response(json_data, status_code=200, etag=None):
+    if isinstance(json_data, str):
+        json_data = json_data.encode()
+    elif not isinstance(json_data, bytes):
+        json_data = orjson.dumps(json_data, option=orjson.OPT_NON_STR_KEYS)
+    response = Response(
+        json_data,
+        status=status_code,
+        mimetype='application/json',
+        direct_passthrough=True
+    )
+    response.content_length = len(json_data)
+    if etag is not None:
+        response.set_etag(etag)
     return response
 
 
+def not_modified_response(etag):
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
 def make_error_response(e):
     return make_json_response({'error': e.messages}, 400)
 
@@ -101,6 +165,13 @@ def exception_response(e):
     abort(500)
 
 
+@lru_cache(maxsize=32)
+def compile_patterns(patterns):
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{p})' for p in patterns))
+
+
 class Role(Enum):
     READER = 1
     TRANSACTOR = 2
@@ -110,16 +181,23 @@ class Role(Enum):
     def addresses(self):
         return current_app.config.get(f'{self.name}_ADDRESSES')
 
+    def pattern(self):
+        return compile_patterns(tuple(self.addresses()))
+
+    def matches(self, address):
+        pattern = self.pattern()
+        return pattern is not None and pattern.fullmatch(address) is not None
+
     @classmethod
     def address_roles(cls, address):
-        return [role for role in Role if any(
-            re.fullmatch(x, address) for x in role.addresses()
-        )]
+        return [role for role in Role if role.matches(address)]
 
     @classmethod
     def address_role(cls, address):
-        roles = cls.address_roles(address)
-        return roles[-1] if roles else None
+        for role in reversed(Role):
+            if role.matches(address):
+                return role
+        return None
 
 
 class TokenView(MethodView):
@@ -145,15 +223,22 @@ class TokenView(MethodView):
         api_token.reset()
         if (role := Role.address_role(address)) is None:
             abort(403)
-        token = jwt.encode(
-            {
-                'sub': address,
-                'rol': str(role.name),
-                'exp': now().timestamp() + API_TOKEN_SECONDS
-            },
-            current_app.config['SECRET_KEY'],
-            algorithm='HS256'
-        )
+        if current_app.config.get('API_SESSION_TOKENS'):
+            token = secrets.token_urlsafe(32)
+            cache.set(
+                f'sess:{token}', f'{address}|{role.name}',
+                timeout=API_TOKEN_SECONDS
+            )
+        else:
+            token = jwt.encode(
+                {
+                    'sub': address,
+                    'rol': str(role.name),
+                    'exp': now().timestamp() + API_TOKEN_SECONDS
+                },
+                current_app.config['SECRET_KEY'],
+                algorithm='HS256'
+            )
         return make_json_response({'token': token})
 
 
@@ -164,39 +249,69 @@ blueprint.add_url_rule(
 )
 
 
+@lru_cache(maxsize=8)
+def token_hmac(secret):
+    if isinstance(secret, str):
+        secret = secret.encode()
+    return hmac.new(secret, digestmod=hashlib.sha256)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def decode_token(token, secret):
+    try:
+        signing_input, signature = token.encode().rsplit(b'.', 1)
+        header, payload = signing_input.split(b'.')
+        header = orjson.loads(base64url_decode(header))
+        signature = base64url_decode(signature)
+        payload = orjson.loads(base64url_decode(payload))
+    except ValueError as e:
+        raise jwt.exceptions.DecodeError() from e
+    if header.get('alg') != 'HS256':
+        raise jwt.exceptions.InvalidAlgorithmError()
+    mac = token_hmac(secret).copy()
+    mac.update(signing_input)
+    if not hmac.compare_digest(mac.digest(), signature):
+        raise jwt.exceptions.InvalidSignatureError()
+    return payload
+
+
+def token_identity():
+    token = request.headers.get('Authorization')
+    if not token or not token.startswith('Bearer '):
+        return None
+    token = token[7:]
+    if '.' not in token:
+        if (identity := cache.get(f'sess:{token}')) is None:
+            return None
+        address, role_name = identity.split('|')
+        return address, Role[role_name]
+    data = decode_token(token, current_app.config['SECRET_KEY'])
+    if data['exp'] <= now().timestamp():
+        return None
+    return data['sub'], Role[data['rol']]
+
+
+@blueprint.before_request
+def identify_request():
+    try:
+        g.identity = token_identity()
+    except Exception as e:
+        current_app.logger.exception(e)
+        g.identity = None
+
+
 def authorize(required_role=Role.READER):
     def _authorize(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            authorized = False
-            address = None
-            role = None
-            try:
-                token = request.headers.get('Authorization')
-                if token and token.startswith('Bearer '):
-                    token = token[7:]
-                else:
-                    token = None
-                if token:
-                    data = jwt.decode(
-                        token,
-                        current_app.config['SECRET_KEY'],
-                        algorithms=['HS256']
-                    )
-                    address = data['sub']
-                    role = Role[data['rol']]
-                    if address and role.value >= required_role.value:
-                        authorized = True
-            except jwt.exceptions.ExpiredSignatureError:
+            if (identity := g.get('identity')) is None:
                 abort(401)
-            except Exception as e:
-                current_app.logger.exception(e)
+            address, role = identity
+            if not address or role.value < required_role.value:
                 abort(401)
-            if authorized:
-                kwargs['_address'] = address
-                kwargs['_role'] = role
-                return func(*args, **kwargs)
-            abort(401)
+            kwargs['_address'] = address
+            kwargs['_role'] = role
+            return func(*args, **kwargs)
         return wrapper
     return _authorize
 
@@ -216,14 +331,16 @@ class BlockView(MethodView):
                 block = lc.last_block if lc else None
                 block_hash = block.block_hash if block else None
             if block_hash:
+                if response := not_modified_response(block_hash):
+                    return response
                 key = f'{block_hash}.block-json'
                 if (block_json := cache.get(key)) is None:
                     block = block or Block.from_db(block_hash)
                     if block is not None:
-                        block_json = block.to_json()
+                        block_json = block.to_json().encode()
                         cache.set(key, block_json)
                 if block_json:
-                    return make_json_response(block_json)
+                    return make_json_response(block_json, etag=block_hash)
         except CCError as err:
             return make_error_response(err)
         except Exception as e:
@@ -469,7 +586,7 @@ class PendingTxnView(MethodView):
             pending_json = node.pending_txns.query_json(
                 earliest=earliest, expired=expired
             )
-            return make_json_response([json.loads(j) for j in pending_json])
+            return make_json_response(f'[{",".join(pending_json)}]'.encode())
         except (ValidationError, CCError) as err:
             return make_error_response(err)
         except Exception as e:
@@ -492,13 +609,15 @@ class WalletBalanceView(MethodView):
             if lc is None:
                 raise EmptyChainError()
             block_hash = lc.block_hash
-            key = f'{block_hash}.{address}.wallet-balance'
-            if (balance := cache.get(key)) is None:
-                balance = lc.balance(address)
-                cache.set(key, balance)
-            return make_json_response(
-                {'balance': balance, 'as_of_block': block_hash}
-            )
+            if response := not_modified_response(block_hash):
+                return response
+            key = f'{block_hash}.{address}.wallet-balance-json'
+            if (body := cache.get(key)) is None:
+                body = orjson.dumps(
+                    {'balance': lc.balance(address), 'as_of_block': block_hash}
+                )
+                cache.set(key, body)
+            return make_json_response(body, etag=block_hash)
         except CCError as err:
             return make_error_response(err)
         except Exception as e:
@@ -521,13 +640,16 @@ class SubjectBalanceView(MethodView):
             if lc is None:
                 raise EmptyChainError()
             block_hash = lc.block_hash
-            key = f'{block_hash}.{subject}.balance'
-            if (balance := cache.get(key)) is None:
-                balance = lc.subject_balance(subject)
-                cache.set(key, balance)
-            return make_json_response(
-                {'balance': balance, 'as_of_block': block_hash}
-            )
+            if response := not_modified_response(block_hash):
+                return response
+            key = f'{block_hash}.{subject}.balance-json'
+            if (body := cache.get(key)) is None:
+                body = orjson.dumps({
+                    'balance': lc.subject_balance(subject),
+                    'as_of_block': block_hash
+                })
+                cache.set(key, body)
+            return make_json_response(body, etag=block_hash)
         except CCError as err:
             return make_error_response(err)
         except Exception as e:
@@ -550,13 +672,16 @@ class SubjectSupportView(MethodView):
             if lc is None:
                 raise EmptyChainError()
             block_hash = lc.block_hash
-            key = f'{block_hash}.{subject}.support'
-            if (support := cache.get(key)) is None:
-                support = lc.subject_support(subject)
-                cache.set(key, support)
-            return make_json_response(
-                {'support': support, 'as_of_block': block_hash}
-            )
+            if response := not_modified_response(block_hash):
+                return response
+            key = f'{block_hash}.{subject}.support-json'
+            if (body := cache.get(key)) is None:
+                body = orjson.dumps({
+                    'support': lc.subject_support(subject),
+                    'as_of_block': block_hash
+                })
+                cache.set(key, body)
+            return make_json_response(body, etag=block_hash)
         except CCError as err:
             return make_error_response(err)
         except Exception as e:
@@ -1,7 +1,10 @@
 import json
-from urllib.parse import urljoin
+import threading
+from time import monotonic
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from cancelchain.util import dt_2_ciso, host_address
 
@@ -9,6 +12,10 @@ OK = requests.codes.ok
 UNAUTHORIZED = requests.codes.unauthorized
 PEER_HOST_HEADER = 'Peer-Hosts'
 ADDRESS_MISMATCH_MSG = 'Address/wallet mismatch'
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 64
+MAX_RETRIES = Retry(total=2, backoff_factor=0.1)
+TOKEN_REFRESH_SECONDS = 60 * 60
 
 
 def json_header(headers=None):
@@ -24,27 +31,51 @@ def peer_header(visited_hosts, headers=None):
     return headers
 
 
+def create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=MAX_RETRIES
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class ApiClient:
-    def __init__(self, host, wallet, timeout=None):
+    def __init__(self, host, wallet, timeout=None, session=None):
         host, address = host_address(host)
         if address and address != wallet.address:
             raise Exception(ADDRESS_MISMATCH_MSG)
         self.host = host
+        self.base_url = f'{host.rstrip("/")}/'
         self.wallet = wallet
         self.token = None
+        self.token_refresh_at = None
+        self.token_lock = threading.Lock()
         self.timeout = timeout if timeout is not None else 10
+        self.owns_session = session is None
+        self.session = create_session() if session is None else session
+
+    def close(self):
+        if self.owns_session:
+            self.session.close()
+
+    def url(self, path):
+        if '://' in path:
+            return path
+        return f'{self.base_url}{path.lstrip("/")}'
 
     def request_token(self, rfs=True):
-        r = requests.get(
-            urljoin(self.host, f'/api/token/{self.wallet.address}'),
-            timeout=self.timeout
-        )
+        url = f'{self.base_url}api/token/{self.wallet.address}'
+        r = self.session.get(url, timeout=self.timeout)
         if rfs:
             r.raise_for_status()
         if r.status_code == OK:
             secret = self.wallet.decrypt(r.json().get('cipher')).decode()
-            r = requests.post(
-                urljoin(self.host, f'/api/token/{self.wallet.address}'),
+            r = self.session.post(
+                url,
                 headers=json_header(),
                 data=json.dumps({'challenge': secret}),
                 timeout=self.timeout
@@ -55,13 +86,21 @@ class ApiClient:
                 return r.json().get('token')
         return None
 
+    def token_stale(self):
+        return self.token is None or monotonic() >= self.token_refresh_at
+
     def get_token(self, rfs=True):
-        if self.token is None:
-            self.token = self.request_token(rfs=rfs)
+        if self.token_stale():
+            with self.token_lock:
+                if self.token_stale():
+                    self.token = self.request_token(rfs=rfs)
+                    self.token_refresh_at = monotonic() + TOKEN_REFRESH_SECONDS
         return self.token
 
-    def reset_token(self):
-        self.token = None
+    def reset_token(self, token=None):
+        with self.token_lock:
+            if token is None or token == self.token:
+                self.token = None
 
     def auth_header(self, headers=None, rfs=True):
         headers = headers or {}
@@ -80,14 +119,15 @@ class ApiClient:
         timeout = self.timeout if timeout is None else timeout
         for _i in range(2):
             headers = self.auth_header(headers=headers, rfs=raise_for_status)
-            r = requests.get(
-                urljoin(self.host, path),
+            token = self.token
+            r = self.session.get(
+                self.url(path),
                 headers=headers,
                 params=params,
                 timeout=timeout
             )
             if r.status_code == UNAUTHORIZED:
-                self.reset_token()
+                self.reset_token(token)
             else:
                 break
         if raise_for_status:
@@ -104,14 +144,15 @@ class ApiClient:
         timeout = self.timeout if timeout is None else timeout
         for _i in range(2):
             headers = self.auth_header(headers=headers, rfs=raise_for_status)
-            r = requests.post(
-                urljoin(self.host, path),
+            token = self.token
+            r = self.session.post(
+                self.url(path),
                 headers=headers,
                 data=data,
                 timeout=timeout
             )
             if r.status_code == UNAUTHORIZED:
-                self.reset_token()
+                self.reset_token(token)
             else:
                 break
         if raise_for_status:
@@ -207,12 +248,13 @@ class ApiClient:
         )
 
     def post_block(
-        self, block, visited_hosts=None, timeout=None, raise_for_status=True
+        self, block, visited_hosts=None, timeout=None, raise_for_status=True,
+        block_json=None
     ):
         headers = peer_header(visited_hosts, headers=json_header())
         return self.post(
             f'/api/block/{block.block_hash}',
-            data=block.to_json(),
+            data=block_json if block_json is not None else block.to_json(),
             headers=headers,
             timeout=timeout,
             raise_for_status=raise_for_status
@@ -1,19 +1,27 @@
 import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from werkzeug.routing import BaseConverter, ValidationError
 
 from cancelchain import __version__, api, browser, command
 from cancelchain.api_client import ApiClient
 from cancelchain.payload import decode_subject, validate_subject
-from cancelchain.schema import validate_address_format, validate_base64
+from cancelchain.schema import validate_address_format, validate_mill_hash
 from cancelchain.util import host_address
 from cancelchain.wallet import Wallet
 
+MAX_WALLET_WORKERS = 8
+DATETIME_CACHE_SIZE = 4096
+UTC_DATETIME_FORMAT = '%a %b %d %H:%M:%S %Z'
+
 
 def init_app(app, register_browser=True):
     app.wallets = read_wallets(app)
     app.clients = create_clients(app)
+    app.node_client = create_node_client(app)
+    app.command_clients = {}
 
     app.url_map.converters['address'] = AddressConverter
     app.url_map.converters['mill_hash'] = MillHashConverter
@@ -37,32 +45,52 @@ def init_app(app, register_browser=True):
         return {'cc_version': __version__}
 
     @app.template_filter('utc_datetime')
-    def utc_datetime(value, fmt="%a %b %d %H:%M:%S %Z"):
-        if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
-            value = value.replace(tzinfo=datetime.timezone.utc)
-        value = value.astimezone(datetime.timezone.utc)
-        return value.strftime(fmt) if value is not None else None
+    def utc_datetime(value, fmt=UTC_DATETIME_FORMAT):
+        return format_utc_datetime(value, fmt) if value is not None else None
 
     @app.template_filter('human_subject')
     def human_subject(value):
         return decode_subject(value) if value is not None else None
 
 
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def format_utc_datetime(value, fmt):
+    if value.tzinfo is not datetime.timezone.utc:
+        if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        value = value.astimezone(datetime.timezone.utc)
+    return value.strftime(fmt)
+
+
+def read_wallet(app, filename):
+    try:
+        return Wallet.from_file(filename)
+    except Exception as e:
+        app.logger.error(f'Error reading {filename}')
+        app.logger.exception(e)
+    return None
+
+
 def read_wallets(app):
     walletdir = app.config.get('WALLET_DIR')
     wallets = {}
     if walletdir and os.path.isdir(walletdir):
-        for dirpath, _, filenames in os.walk(walletdir):
-            for filename in filenames:
-                if filename.endswith('.pem'):
-                    try:
-                        w = Wallet.from_file(os.path.join(dirpath, filename))
-                        wallets[w.address] = w
-                    except Exception as e:
-                        app.logger.error(
-                            f'Error reading {os.path.join(dirpath, filename)}'
-                        )
-                        app.logger.exception(e)
+        filenames = [
+            os.path.join(dirpath, filename)
+            for dirpath, _, filenames in os.walk(walletdir)
+            for filename in filenames if filename.endswith('.pem')
+        ]
+        workers = min(MAX_WALLET_WORKERS, len(filenames))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda filename: read_wallet(app, filename), filenames
+                ))
+        else:
+            results = [read_wallet(app, filename) for filename in filenames]
+        for w in results:
+            if w is not None:
+                wallets[w.address] = w
     return wallets
 
 
@@ -80,6 +108,18 @@ def create_clients(app):
     return clients
 
 
+def create_node_client(app):
+    if not (node_host := app.config.get('NODE_HOST')):
+        return None
+    host, address = host_address(node_host)
+    if not (wallet := app.wallets.get(address)):
+        app.logger.warning(f'Node client wallet {address} for {host} not found')
+        return None
+    return ApiClient(
+        host, wallet, timeout=app.config.get('API_CLIENT_TIMEOUT')
+    )
+
+
 class AddressConverter(BaseConverter):
     def to_python(self, value):
         if not validate_address_format(value):
@@ -89,7 +129,7 @@ class AddressConverter(BaseConverter):
 
 class MillHashConverter(BaseConverter):
     def to_python(self, value):
-        if len(value) != 64 or not validate_base64(value):
+        if not validate_mill_hash(value):
             raise ValidationError
         return value
 
@@ -1,7 +1,14 @@
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import timedelta
+from functools import lru_cache, total_ordering
+from hashlib import sha256
 from json import JSONDecodeError
+from threading import Lock
 
+import orjson
 from marshmallow import (
     ValidationError,
     fields,
@@ -9,8 +16,6 @@ from marshmallow import (
     validate,
     validates_schema,
 )
-from pymerkle import MerkleTree, verify_inclusion
-from pymerkle.proof import InvalidProof
 
 from cancelchain.exceptions import (
     ExpiredTransactionError,
@@ -26,7 +31,7 @@ from cancelchain.exceptions import (
     SealedBlockError,
     UnlinkedBlockError,
 )
-from cancelchain.milling import mill_hash_str, milling_generator
+from cancelchain.milling import mill_hash_bin, mill_hash_str, milling_generator
 from cancelchain.models import BlockDAO
 from cancelchain.schema import (
     MillHash,
@@ -41,10 +46,111 @@ VERSION_1 = '1'
 MAX_TRANSACTIONS = 100
 TXN_TIMEOUT = timedelta(hours=4)
 MISSED_TARGET_MSG = 'Missed target'
+VALIDATED_CACHE_SIZE = 1024
+TXN_VALIDATION_WORKERS = min(8, os.cpu_count() or 1)
+
+validated_blocks = OrderedDict()
+validated_blocks_lock = Lock()
+
+
+def validate_digest_diff(digest, target):
+    target = bytes.fromhex(target)
+    if len(digest) != len(target):
+        return int.from_bytes(digest, 'big') < int.from_bytes(target, 'big')
+    return digest < target
 
 
 def validate_hash_diff(block_hash, target):
-    return int(block_hash, 16) < int(target, 16)
+    return validate_digest_diff(bytes.fromhex(block_hash), target)
+
+
+def is_validated(fingerprint):
+    with validated_blocks_lock:
+        if fingerprint in validated_blocks:
+            validated_blocks.move_to_end(fingerprint)
+            return True
+    return False
+
+
+def set_validated(fingerprint):
+    with validated_blocks_lock:
+        validated_blocks[fingerprint] = None
+        validated_blocks.move_to_end(fingerprint)
+        while len(validated_blocks) > VALIDATED_CACHE_SIZE:
+            validated_blocks.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
+def txn_validation_executor(pid):
+    return ThreadPoolExecutor(max_workers=TXN_VALIDATION_WORKERS)
+
+
+def validate_txns(txns):
+    if TXN_VALIDATION_WORKERS < 2 or len(txns) < 2:
+        for txn in txns:
+            yield txn, txn.validate
+        return
+    executor = txn_validation_executor(os.getpid())
+    futures = [executor.submit(txn.validate) for txn in txns]
+    for txn, future in zip(txns, futures):
+        yield txn, future.result
+
+
+def merkle_leaf(txid):
+    return sha256(b'\x00' + txid.encode()).hexdigest().encode()
+
+
+def merkle_node(left, right):
+    return sha256(b'\x01' + left + b'\x01' + right).hexdigest().encode()
+
+
+def merkle_subroot(leaves):
+    subtrees = []
+    for leaf in leaves:
+        size, digest = 1, leaf
+        while subtrees and subtrees[-1][0] == size:
+            left_size, left = subtrees.pop()
+            size += left_size
+            digest = merkle_node(left, digest)
+        subtrees.append((size, digest))
+    if not subtrees:
+        return None
+    _, root = subtrees.pop()
+    while subtrees:
+        _, left = subtrees.pop()
+        root = merkle_node(left, root)
+    return root
+
+
+def merkle_root(txids):
+    root = merkle_subroot(merkle_leaf(txid) for txid in txids)
+    return root.decode() if root else None
+
+
+def merkle_path(txids, idx):
+    leaves = [merkle_leaf(txid) for txid in txids]
+    path = []
+    lo, hi = 0, len(leaves)
+    while hi - lo > 1:
+        split = lo + (1 << ((hi - lo - 1).bit_length() - 1))
+        if idx < split:
+            path.append((False, merkle_subroot(leaves[split:hi])))
+            hi = split
+        else:
+            path.append((True, merkle_subroot(leaves[lo:split])))
+            lo = split
+    path.reverse()
+    return path
+
+
+def verify_merkle_path(txid, path, root):
+    digest = merkle_leaf(txid)
+    for is_left, sibling in path:
+        if is_left:
+            digest = merkle_node(sibling, digest)
+        else:
+            digest = merkle_node(digest, sibling)
+    return root is not None and digest.decode() == root
 
 
 class BlockSchema(SansNoneSchema):
@@ -74,7 +180,11 @@ class BlockSchema(SansNoneSchema):
         return Block(**data)
 
 
-@dataclass(order=True)
+block_schema = BlockSchema()
+
+
+@total_ordering
+@dataclass(eq=False)
 class Block:
     idx: int = field(default=None)
     timestamp: str = field(default=None)
@@ -86,6 +196,41 @@ class Block:
     txns: list[Transaction] = field(default_factory=list, compare=False)
     version: str = field(default=VERSION_1, compare=False, repr=False)
 
+    _header_hash_cache = None
+    _merkle_root_cache = None
+    _inflow_index_cache = None
+
+    def __getattr__(self, name):
+        dao = self.__dict__.get('_dao')
+        if name != 'txns' or dao is None:
+            raise AttributeError(name)
+        self.txns = [
+            Transaction.from_dao(txn_dao) for txn_dao in dao.transactions
+        ]
+        self._dao = None
+        return self.txns
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.idx == other.idx and
+            self.timestamp == other.timestamp and
+            self.block_hash == other.block_hash
+        )
+
+    def __lt__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        if self.idx != other.idx:
+            return self.idx < other.idx
+        if self.timestamp != other.timestamp:
+            return self.timestamp < other.timestamp
+        return (
+            self.block_hash != other.block_hash and
+            self.block_hash < other.block_hash
+        )
+
     @property
     def timestamp_dt(self):
         return iso_2_dt(self.timestamp) if self.timestamp else None
@@ -102,17 +247,38 @@ class Block:
     def coinbase(self):
         return self.last_txn if self.is_sealed else None
 
+    @property
+    def totals(self):
+        schadenfreude = grace = mudita = 0
+        for t in self.txns:
+            s, g, m = t.totals
+            schadenfreude += s
+            grace += g
+            mudita += m
+        return (schadenfreude, grace, mudita)
+
+    @property
+    def inflow_index(self):
+        txids = tuple(t.txid for t in self.txns)
+        cached = self._inflow_index_cache
+        if cached is None or cached[0] != txids:
+            cached = self._inflow_index_cache = (txids, Counter(
+                (i.outflow_txid, i.outflow_idx)
+                for t in self.txns for i in t.inflows
+            ))
+        return cached[1]
+
     @property
     def schadenfreude(self):
-        return sum([t.schadenfreude for t in self.txns])
+        return self.totals[0]
 
     @property
     def grace(self):
-        return sum([t.grace for t in self.txns])
+        return self.totals[1]
 
     @property
     def mudita(self):
-        return sum([t.mudita for t in self.txns])
+        return self.totals[2]
 
     @property
     def is_sealed(self):
@@ -141,35 +307,34 @@ class Block:
         return self.potential_header(self.proof_of_work)
 
     def get_header_hash(self):
-        return mill_hash_str(self.header)
+        header = self.header
+        cached = self._header_hash_cache
+        if cached is None or cached[0] != header:
+            cached = self._header_hash_cache = (header, mill_hash_str(header))
+        return cached[1]
 
     def potential_header(self, proof_of_work):
         return f'{self.unproven_header}{proof_of_work}'
 
     def validate_proof_of_work(self, proof_of_work):
-        potential_header = self.potential_header(proof_of_work)
-        return validate_hash_diff(mill_hash_str(potential_header), self.target)
-
-    def build_merkle_tree(self):
-        tree = MerkleTree()
-        for record in (t.txid for t in self.txns):
-            tree.append_entry(record)
-        return tree
+        potential_header = self.unproven_header.encode() + b'%d' % proof_of_work
+        return validate_digest_diff(
+            mill_hash_bin(potential_header), self.target
+        )
 
     def get_merkle_root(self):
-        root_hash = self.build_merkle_tree().root
-        return root_hash.decode() if root_hash else None
+        txids = tuple(t.txid for t in self.txns)
+        cached = self._merkle_root_cache
+        if cached is None or cached[0] != txids:
+            cached = self._merkle_root_cache = (txids, merkle_root(txids))
+        return cached[1]
 
     def in_merkle_tree(self, txid):
-        tree = self.build_merkle_tree()
-        target = tree.root
-        proof = tree.prove_inclusion(txid)
-        try:
-            verify_inclusion(txid, target, proof)
-        except InvalidProof:
+        txids = [t.txid for t in self.txns]
+        if txid not in txids:
             return False
-        else:
-            return True
+        path = merkle_path(txids, txids.index(txid))
+        return verify_merkle_path(txid, path, self.get_merkle_root())
 
     def add_txn(self, txn, is_coinbase=False):
         if self.is_sealed:
@@ -181,9 +346,7 @@ class Block:
         self.txns.append(txn)
 
     def create_coinbase(self, wallet, reward):
-        return Transaction.coinbase(
-            wallet, reward, self.schadenfreude, self.grace, self.mudita
-        )
+        return Transaction.coinbase(wallet, reward, *self.totals)
 
     def add_coinbase(self, wallet, reward):
         self.add_txn(self.create_coinbase(wallet, reward), is_coinbase=True)
@@ -225,6 +388,9 @@ class Block:
 
     def validate_transaction(self, txn, prev_txn=None):
         txn.validate(coinbase=False)
+        self.validate_transaction_order(txn, prev_txn=prev_txn)
+
+    def validate_transaction_order(self, txn, prev_txn=None):
         txn_ts_dt = txn.timestamp_dt
         if self.timestamp_dt and txn_ts_dt > self.timestamp_dt:
             raise FutureTransactionError()
@@ -238,25 +404,24 @@ class Block:
         if not cb:
             raise MissingCoinbaseError()
         cb.validate_coinbase()
-        comps = []
-        if self.schadenfreude:
-            comps.append(self.schadenfreude)
-        if self.grace:
-            comps.append(self.grace)
-        if self.mudita:
-            comps.append(self.mudita)
+        comps = [total for total in self.totals if total]
         if comps != [o.amount for o in cb.outflows[1:]]:
             raise InvalidCoinbaseError()
 
     def validate(self):
-        if errors := BlockSchema().validate(self.to_dict()):
+        block_dict = self.to_dict()
+        fingerprint = sha256(orjson.dumps(block_dict)).digest()
+        if is_validated(fingerprint):
+            return
+        if errors := block_schema.validate(block_dict):
             raise InvalidBlockError(errors)
         self.validate_block_hash()
         self.validate_merkle_root()
         prev_txn = None
-        for txn in self.regular_txns:
+        for txn, validate_txn in validate_txns(self.regular_txns):
             try:
-                self.validate_transaction(txn, prev_txn=prev_txn)
+                validate_txn()
+                self.validate_transaction_order(txn, prev_txn=prev_txn)
             except InvalidTransactionError as e:
                 raise InvalidBlockError({f'Transaction {txn.txid}': e.messages})
             prev_txn = txn
@@ -264,12 +429,13 @@ class Block:
             self.validate_coinbase()
         except InvalidTransactionError as e:
             raise InvalidBlockError(e.messages)
+        set_validated(fingerprint)
 
     def to_dict(self):
         return asdict_sans_none(self)
 
     def to_json(self):
-        return BlockSchema().dumps(self.to_dict())
+        return orjson.dumps(self.to_dict()).decode()
 
     def to_dao(self):
         return BlockDAO.get(self.block_hash) or BlockDAO(
@@ -278,20 +444,24 @@ class Block:
             self.target, transaction_daos=[txn.to_dao() for txn in self.txns]
         )
 
-    def to_db(self):
-        self.to_dao().commit()
+    def to_db(self, commit=True):
+        dao = self.to_dao()
+        if commit:
+            dao.commit()
+        else:
+            dao.flush()
 
     @classmethod
     def from_dict(cls, d):
         try:
-            return BlockSchema().load(d)
+            return block_schema.load(d)
         except ValidationError as e:
             raise InvalidBlockError(e.messages)
 
     @classmethod
     def from_json(cls, j):
         try:
-            return BlockSchema().loads(j)
+            return block_schema.load(orjson.loads(j))
         except JSONDecodeError as je:
             raise InvalidBlockError(je.msg)
         except ValidationError as ve:
@@ -299,7 +469,7 @@ class Block:
 
     @classmethod
     def from_dao(cls, dao):
-        return cls(
+        block = cls(
             idx=dao.idx,
             timestamp=dt_2_iso(dao.timestamp),
             block_hash=dao.block_hash,
@@ -307,11 +477,11 @@ class Block:
             target=dao.target,
             proof_of_work=dao.proof_of_work,
             merkle_root=dao.merkle_root,
-            txns=[
-                Transaction.from_dao(txn_dao) for txn_dao in dao.transactions
-            ],
             version=dao.version
         )
+        del block.txns
+        block._dao = dao
+        return block
 
     @classmethod
     def from_db(cls, block_hash):
@@ -81,9 +81,16 @@ def transaction_view(txid):
         if transaction_dao is None:
             abort(404)
         transaction = Transaction.from_dao(transaction_dao)
+        ioflow_daos = TransactionDAO.get_many(
+            inflow.outflow_txid for inflow in transaction.inflows
+        )
+        ioflow_txns = {}
         for inflow in transaction.inflows:
-            transaction_dao = TransactionDAO.get(inflow.outflow_txid)
-            ioflow_txn = Transaction.from_dao(transaction_dao)
+            ioflow_txn = ioflow_txns.get(inflow.outflow_txid)
+            if ioflow_txn is None:
+                ioflow_txn = ioflow_txns[inflow.outflow_txid] = (
+                    Transaction.from_dao(ioflow_daos[inflow.outflow_txid])
+                )
             ioflow = ioflow_txn.get_outflow(inflow.outflow_idx)
             inflows.append((inflow, ioflow_txn, ioflow))
             inflow_total += ioflow.amount
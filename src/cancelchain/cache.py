@@ -1,3 +1,21 @@
 from flask_caching import Cache
 
+NULL_CACHE_TYPES = frozenset({
+    'null',
+    'NullCache',
+    'flask_caching.backends.NullCache',
+    'flask_caching.backends.nullcache.NullCache',
+})
+SESSION_TOKENS_CACHE_MSG = (
+    'API_SESSION_TOKENS requires a CACHE_TYPE that can store sessions'
+)
+
 cache = Cache()
+
+
+def validate_cache_config(app):
+    if (
+        app.config.get('API_SESSION_TOKENS') and
+        app.config.get('CACHE_TYPE') in NULL_CACHE_TYPES
+    ):
+        raise RuntimeError(SESSION_TOKENS_CACHE_MSG)
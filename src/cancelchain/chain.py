@@ -1,6 +1,9 @@
 import json
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
-from functools import total_ordering
+from functools import lru_cache, total_ordering
+
+from sqlalchemy import inspect
 
 from cancelchain.block import Block
 from cancelchain.exceptions import (
@@ -22,7 +25,7 @@ from cancelchain.exceptions import (
     SpentTransactionError,
 )
 from cancelchain.milling import mill_hash_str
-from cancelchain.models import BlockDAO, ChainDAO
+from cancelchain.models import BlockDAO, ChainDAO, TransactionDAO
 from cancelchain.payload import Inflow, Outflow
 from cancelchain.transaction import Transaction
 from cancelchain.util import dt_2_iso, now
@@ -34,6 +37,82 @@ REWARD = 100 * CURMUDGEON_PER_GRUMBLE
 TARGET_GOAL_SECONDS = 600
 TARGET_INTERVAL = 2016
 TARGET_INTERVAL_SECONDS = TARGET_GOAL_SECONDS * TARGET_INTERVAL
+TARGET_CACHE_SIZE = 64
+OUTFLOW_BATCH_SIZE = 32
+PREFETCH_BLOCKS = 256
+BLOCK_INDEX_SIZE = 8192
+
+
+@lru_cache(maxsize=TARGET_CACHE_SIZE)
+def target_int(target):
+    return int(target, 16)
+
+
+def index_block(block_index, block):
+    block_index[block.idx] = block.block_hash
+    block_index.move_to_end(block.idx)
+    if len(block_index) > BLOCK_INDEX_SIZE:
+        block_index.popitem(last=False)
+
+
+def is_balanced(inflow_amounts, outflows):
+    # add inflow amounts
+    subject_amounts = Counter()
+    other_amounts = 0
+    for amount, subject in inflow_amounts:
+        if subject:
+            subject_amounts[subject] += amount
+        else:
+            other_amounts += amount
+    # subtract outflow amounts
+    for o in outflows:
+        if o.forgive:
+            subject_amounts[o.forgive] -= o.amount
+        elif o.subject:
+            subject_amount = subject_amounts[o.subject]
+            if subject_amount > 0:
+                spillover = o.amount - subject_amount
+                if spillover > 0:
+                    subject_amounts[o.subject] = 0
+                    other_amounts -= spillover
+                else:
+                    subject_amounts[o.subject] = -spillover
+            else:
+                other_amounts -= o.amount
+        else:
+            other_amounts -= o.amount
+    if other_amounts != 0:
+        return False
+    return not any(subject_amounts.values())
+
+
+def prefetch_txns(blocks, size=PREFETCH_BLOCKS):
+    def load_txns(window):
+        txn_daos = TransactionDAO.block_transactions(
+            block.block_hash for block in window
+        )
+        for block in window:
+            block.txns = [
+                Transaction.from_dao(txn_dao)
+                for txn_dao in txn_daos.get(block.block_hash, [])
+            ]
+            yield block
+
+    window = []
+    blocks = iter(blocks)
+    while True:
+        try:
+            block = next(blocks)
+        except StopIteration:
+            break
+        except Exception:
+            yield from load_txns(window)
+            raise
+        window.append(block)
+        if len(window) >= size:
+            yield from load_txns(window)
+            window = []
+    yield from load_txns(window)
 
 
 def is_genesis_block(block):
@@ -46,13 +125,38 @@ class Chain:
     cid: int = field(default=None, compare=False)
     block_hash: str = field(default=None, compare=True)
 
+    _last_block_cache = None
+    _target_cache = None
+    _interval_target_cache = None
+    _txn_cache = None
+    _inflow_counts = None
+    _dao_cache = None
+    _block_index_cache = None
+
     @property
     def blocks(self):
-        return self.block_chain(block_hash=self.block_hash)
+        block_index = self.block_index
+        for block in self.block_chain(block_hash=self.block_hash):
+            index_block(block_index, block)
+            yield block
+
+    @property
+    def block_index(self):
+        cached = self._block_index_cache
+        if cached is None or cached[0] != self.block_hash:
+            cached = self._block_index_cache = (
+                self.block_hash, OrderedDict()
+            )
+        return cached[1]
 
     @property
     def last_block(self):
-        return next(self.blocks, None)
+        cached = self._last_block_cache
+        if cached is None or cached[0] != self.block_hash:
+            cached = self._last_block_cache = (
+                self.block_hash, next(self.blocks, None)
+            )
+        return cached[1]
 
     @property
     def length(self):
@@ -60,14 +164,27 @@ class Chain:
 
     @property
     def target(self):
-        return self.block_target()
+        cached = self._target_cache
+        if cached is None or cached[0] != self.block_hash:
+            cached = self._target_cache = (
+                self.block_hash, self.block_target()
+            )
+        return cached[1]
 
     def block_chain(self, block=None, block_hash=None):
         if not block and block_hash:
             block = Block.from_db(block_hash)
+        ancestors = None
         while block is not None:
             yield block
-            prev_block = Block.from_db(block.prev_hash)
+            if ancestors is None:
+                block_dao = BlockDAO.get(block.block_hash)
+                ancestors = iter(block_dao.ancestors if block_dao else ())
+            prev_dao = next(ancestors, None)
+            if prev_dao is None or prev_dao.block_hash != block.prev_hash:
+                prev_dao = BlockDAO.get(block.prev_hash)
+                ancestors = iter(prev_dao.ancestors if prev_dao else ())
+            prev_block = Block.from_dao(prev_dao) if prev_dao else None
             if prev_block is None and not is_genesis_block(block):
                 raise MissingPreviousBlockError()
             if is_genesis_block(block) and prev_block is not None:
@@ -75,21 +192,30 @@ class Chain:
             block = prev_block
 
     def get_block_by_reverse_index(self, i=0):
-        chain_dao = self.to_dao()
-        if chain_dao is not None:
-            index = self.last_block.idx - i
-            block_dao = chain_dao.get_block(idx=index)
-            return Block.from_dao(block_dao) if block_dao else None
-        else:
-            for index, block in enumerate(self.blocks):
-                if index == i:
-                    return block
+        last_block = self.last_block
+        if last_block is None or i > last_block.idx:
+            return None
+        if i == 0:
+            return last_block
+        idx = last_block.idx - i
+        block_index = self.block_index
+        if (block_hash := block_index.get(idx)) is not None:
+            block_index.move_to_end(idx)
+            if (block := Block.from_db(block_hash)) is not None:
+                return block
+        last_block_dao = BlockDAO.get(last_block.block_hash)
+        block_dao = last_block_dao.get_block_in_chain(idx=idx)
+        if block_dao is None:
             return None
+        block = Block.from_dao(block_dao)
+        index_block(block_index, block)
+        return block
 
     def block_target(self, block=None):
-        if not self.last_block:
+        last_block = self.last_block
+        if not last_block:
             return MAX_TARGET
-        last_index = self.last_block.idx
+        last_index = last_block.idx
         index = block.idx if block else last_index + 1
         if index == 0:
             return MAX_TARGET
@@ -97,14 +223,20 @@ class Chain:
         prev_block = self.get_block_by_reverse_index(i + 1)
         prev_target = prev_block.target
         if index % TARGET_INTERVAL == 0:
+            cached = self._interval_target_cache
+            if cached is not None and cached[0] == prev_block.block_hash:
+                return cached[1]
             start_i = i + TARGET_INTERVAL
             start_block = self.get_block_by_reverse_index(start_i)
             interval_delta = prev_block.timestamp_dt - start_block.timestamp_dt
             factor = interval_delta.total_seconds() / TARGET_INTERVAL_SECONDS
             factor = min(max(factor, 0.25), 4.0)
-            new_target = f"{int(int(prev_target, 16) * factor):064x}"
-            if int(new_target, 16) > int(MAX_TARGET, 16):
+            new_target_int = int(target_int(prev_target) * factor)
+            if new_target_int > target_int(MAX_TARGET):
                 new_target = MAX_TARGET
+            else:
+                new_target = f"{new_target_int:064x}"
+            self._interval_target_cache = (prev_block.block_hash, new_target)
             return new_target
         else:
             return prev_target
@@ -122,16 +254,23 @@ class Chain:
     def seal_block(self, block, wallet):
         block.seal(wallet, self.block_reward(block))
 
-    def add_block(self, block):
+    def add_block(self, block, commit=True):
         self.validate_block(block)
-        block.to_db()
+        block.to_db(commit=commit)
+        cached = self._block_index_cache
+        if cached is not None and cached[0] == block.prev_hash:
+            block_index = cached[1]
+        else:
+            block_index = OrderedDict()
+        index_block(block_index, block)
+        self._block_index_cache = (block.block_hash, block_index)
         self.block_hash = block.block_hash
 
     def validate(self, progress=None):
         _progress_next = progress.next if progress else lambda n=1: None
         if not self.last_block:
             raise EmptyChainError()
-        for block in self.blocks:
+        for block in prefetch_txns(self.blocks):
             try:
                 self.validate_block(block)
                 _progress_next(n=1)
@@ -143,7 +282,14 @@ class Chain:
         block.validate()
         if block.timestamp_dt > now():
             raise FutureBlockError()
-        prev_block = Block.from_db(block.prev_hash)
+        last_block = self.last_block
+        extends_tip = (
+            last_block is not None and block.prev_hash == last_block.block_hash
+        )
+        if extends_tip:
+            prev_block = last_block
+        else:
+            prev_block = Block.from_db(block.prev_hash)
         if prev_block is None and not is_genesis_block(block):
             raise InvalidPreviousHashError()
         if prev_block and block.timestamp_dt < prev_block.timestamp_dt:
@@ -154,54 +300,34 @@ class Chain:
         prev_index = prev_block.idx if prev_block else -1
         if block.idx != prev_index + 1:
             raise InvalidBlockIndexError()
-        if block.target != self.block_target(block=block):
+        target = self.target if extends_tip else self.block_target(block=block)
+        if block.target != target:
             raise InvalidTargetError()
-        for txn in block.regular_txns:
-            self.validate_block_txn(block, txn)
+        self._txn_cache = {}
+        self._inflow_counts = self.get_inflows_counts(block, (
+            (i.outflow_txid, i.outflow_idx)
+            for txn in block.regular_txns for i in txn.inflows
+        ))
+        try:
+            for txn in block.regular_txns:
+                self.validate_block_txn(block, txn)
+        finally:
+            self._txn_cache = None
+            self._inflow_counts = None
         self.validate_block_coinbase(block)
 
     def validate_block_txn(self, block, txn, txn_in_block=True):
-        # add inflow amounts
-        subject_amounts = {}
-        other_amounts = 0
-        for i in txn.inflows:
-            amount, subject = self.validate_txn_inflow(
-                block, txn, i, txn_in_block=txn_in_block
-            )
-            if subject:
-                subject_amount = subject_amounts.get(subject, 0)
-                subject_amounts[subject] = subject_amount + amount
-            else:
-                other_amounts += amount
-        # subtract outflow amounts
-        for o in txn.outflows:
-            if o.forgive:
-                forgive_amount = subject_amounts.get(o.forgive, 0)
-                subject_amounts[o.forgive] = forgive_amount - o.amount
-            elif o.subject:
-                subject_amount = subject_amounts.get(o.subject)
-                if subject_amount and subject_amount > 0:
-                    if o.amount > subject_amount:
-                        subject_amounts[o.subject] = 0
-                        other_amounts -= (o.amount - subject_amount)
-                    else:
-                        subject_amounts[o.subject] = subject_amount - o.amount
-                else:
-                    other_amounts -= o.amount
-            else:
-                other_amounts -= o.amount
-        if other_amounts != 0:
+        inflow_amounts = [
+            self.validate_txn_inflow(block, txn, i, txn_in_block=txn_in_block)
+            for i in txn.inflows
+        ]
+        if not is_balanced(inflow_amounts, txn.outflows):
             raise ImbalancedTransactionError()
-        for _, amount in subject_amounts.items():
-            if amount != 0:
-                raise ImbalancedTransactionError()
 
     def validate_txn_inflow(self, block, txn, i, txn_in_block=True):
         # txn inflow's outflow exists
         ioflow = None
-        if ioflow_txn := self.get_transaction(
-            i.outflow_txid, start_block=block
-        ):
+        if ioflow_txn := self.get_cached_transaction(i.outflow_txid, block):
             ioflow = ioflow_txn.get_outflow(i.outflow_idx)
         if not ioflow:
             raise MissingInflowOutflowError()
@@ -213,7 +339,7 @@ class Chain:
         if address != txn.address:
             raise InflowOutflowAddressMismatchError()
         # txn inflow's outflow not already used in other inflow
-        num_inflows = self.get_inflows_count(
+        num_inflows = self.get_cached_inflows_count(
             block, i.outflow_txid, i.outflow_idx
         )
         if (num_inflows > 1 or (num_inflows > 0 and not txn_in_block)):
@@ -230,6 +356,16 @@ class Chain:
         block_dao = self.to_dao().get_block(block_hash)
         return Block.from_dao(block_dao) if block_dao else None
 
+    def get_cached_transaction(self, txid, start_block):
+        txn_cache = self._txn_cache
+        if txn_cache is None:
+            return self.get_transaction(txid, start_block=start_block)
+        if txid not in txn_cache:
+            txn_cache[txid] = self.get_transaction(
+                txid, start_block=start_block
+            )
+        return txn_cache[txid]
+
     def get_transaction(self, txid, start_block=None):
         block = start_block or self.last_block
         while (block_dao := BlockDAO.get(block.block_hash)) is None:
@@ -248,13 +384,7 @@ class Chain:
         i = 0
         block = start_block
         while (block_dao := BlockDAO.get(block.block_hash)) is None:
-            for txn in block.txns:
-                for inflow in txn.inflows:
-                    if (
-                        inflow.outflow_txid == outflow_txid and
-                        inflow.outflow_idx == outflow_idx
-                    ):
-                        i += 1
+            i += block.inflow_index[(outflow_txid, outflow_idx)]
             block = Block.from_db(block.prev_hash)
             if block is None:
                 break
@@ -262,15 +392,37 @@ class Chain:
             i += block_dao.inflows_in_chain_count(outflow_txid, outflow_idx)
         return i
 
+    def get_inflows_counts(self, start_block, outflows):
+        outflows = set(outflows)
+        counts = Counter()
+        block = start_block
+        while (block_dao := BlockDAO.get(block.block_hash)) is None:
+            inflow_index = block.inflow_index
+            for outflow in outflows:
+                counts[outflow] += inflow_index[outflow]
+            block = Block.from_db(block.prev_hash)
+            if block is None:
+                break
+        if block_dao is not None:
+            counts.update(block_dao.inflows_in_chain_counts(outflows))
+        return counts
+
+    def get_cached_inflows_count(self, start_block, outflow_txid, outflow_idx):
+        if self._inflow_counts is None:
+            return self.get_inflows_count(
+                start_block, outflow_txid, outflow_idx
+            )
+        return self._inflow_counts[(outflow_txid, outflow_idx)]
+
     def unspent_outflows(self, address, limit=None, filter_pending=False):
         amount = 0
         outflow_daos = self.to_dao().unspent_outflows(
             address, filter_pending=filter_pending
         )
+        if limit is not None:
+            outflow_daos = outflow_daos.yield_per(OUTFLOW_BATCH_SIZE)
         for outflow_dao in outflow_daos:
-            txn = Transaction.from_dao(outflow_dao.transaction)
-            index = outflow_dao.idx
-            outflow = txn.get_outflow(index=index)
+            outflow = Outflow.from_dao(outflow_dao)
             amount += outflow.amount
             yield (outflow_dao.txid, outflow_dao.idx, outflow)
             if limit is not None and amount >= limit:
@@ -281,10 +433,9 @@ class Chain:
             subject, filter_pending=filter_pending
         )
         for outflow_dao in outflow_daos:
-            txn = Transaction.from_dao(outflow_dao.transaction)
-            index = outflow_dao.idx
-            outflow = txn.get_outflow(index=index)
-            yield (outflow_dao.txid, outflow_dao.idx, outflow)
+            yield (
+                outflow_dao.txid, outflow_dao.idx, Outflow.from_dao(outflow_dao)
+            )
 
     def unforgiven_address_outflows(
         self, address, subject, limit=None, filter_pending=False
@@ -293,10 +444,10 @@ class Chain:
         outflow_daos = self.to_dao().unforgiven_outflows(
             subject, address=address, filter_pending=filter_pending
         )
+        if limit is not None:
+            outflow_daos = outflow_daos.yield_per(OUTFLOW_BATCH_SIZE)
         for outflow_dao in outflow_daos:
-            txn = Transaction.from_dao(outflow_dao.transaction)
-            index = outflow_dao.idx
-            outflow = txn.get_outflow(index=index)
+            outflow = Outflow.from_dao(outflow_dao)
             amount += outflow.amount
             yield (outflow_dao.txid, outflow_dao.idx, outflow)
             if limit is not None and amount >= limit:
@@ -311,18 +462,33 @@ class Chain:
     def subject_support(self, subject):
         return int(self.to_dao().subject_support(subject))
 
-    def create_transfer(self, wallet, amount, dest_address):
-        address = wallet.address
-        balance = 0
-        t = Transaction()
-        unspent = self.unspent_outflows(
-            address, limit=amount, filter_pending=True
-        )
-        for txid, index, outflow in unspent:
-            balance += outflow.amount
+    def collect_inflows(self, t, outflows, balance=0):
+        spent = {(i.outflow_txid, i.outflow_idx) for i in t.inflows}
+        for txid, index, outflow_amount in outflows:
+            if (txid, index) in spent:
+                continue
+            spent.add((txid, index))
+            balance += outflow_amount
             t.add_inflow(Inflow(outflow_txid=txid, outflow_idx=index))
+        return balance
+
+    def collect_unspent_inflows(self, t, address, amount, balance=0):
+        if balance < amount:
+            unspent = self.unspent_outflows(
+                address, limit=amount-balance, filter_pending=True
+            )
+            balance = self.collect_inflows(t, (
+                (txid, index, outflow.amount)
+                for txid, index, outflow in unspent
+            ), balance=balance)
         if balance < amount:
             raise InsufficientFundsError()
+        return balance
+
+    def create_transfer(self, wallet, amount, dest_address):
+        address = wallet.address
+        t = Transaction()
+        balance = self.collect_unspent_inflows(t, address, amount)
         t.add_outflow(Outflow(amount=amount, address=dest_address))
         if balance - amount:
             t.add_outflow(Outflow(amount=balance-amount, address=address))
@@ -334,25 +500,13 @@ class Chain:
         self, wallet, amount, subject, outflows=None, timestamp=None
     ):
         address = wallet.address
-        balance = 0
         t = Transaction()
         if timestamp is not None:
             t.timestamp = dt_2_iso(timestamp)
-        if outflows is not None:
-            for outflow in outflows:
-                balance += outflow[2]
-                t.add_inflow(
-                    Inflow(outflow_txid=outflow[0], outflow_idx=outflow[1])
-                )
-        if balance < amount:
-            unspent = self.unspent_outflows(
-                address, limit=amount-balance, filter_pending=True
-            )
-            for txid, index, outflow in unspent:
-                balance += outflow.amount
-                t.add_inflow(Inflow(outflow_txid=txid, outflow_idx=index))
-        if balance < amount:
-            raise InsufficientFundsError()
+        balance = self.collect_inflows(t, outflows or ())
+        balance = self.collect_unspent_inflows(
+            t, address, amount, balance=balance
+        )
         t.add_outflow(Outflow(amount=amount, subject=subject))
         if balance - amount:
             t.add_outflow(Outflow(amount=balance-amount, address=address))
@@ -362,14 +516,14 @@ class Chain:
 
     def create_forgive(self, wallet, amount, subject):
         address = wallet.address
-        balance = 0
         t = Transaction()
         unforgiven = self.unforgiven_address_outflows(
             address, subject, limit=amount, filter_pending=True
         )
-        for txid, index, outflow in unforgiven:
-            balance += outflow.amount
-            t.add_inflow(Inflow(outflow_txid=txid, outflow_idx=index))
+        balance = self.collect_inflows(t, (
+            (txid, index, outflow.amount)
+            for txid, index, outflow in unforgiven
+        ))
         if balance < amount:
             raise InsufficientFundsError()
         t.add_outflow(Outflow(amount=amount, forgive=subject))
@@ -383,25 +537,13 @@ class Chain:
         self, wallet, amount, subject, outflows=None, timestamp=None
     ):
         address = wallet.address
-        balance = 0
         t = Transaction()
         if timestamp is not None:
             t.timestamp = dt_2_iso(timestamp)
-        if outflows is not None:
-            for outflow in outflows:
-                balance += outflow[2]
-                t.add_inflow(
-                    Inflow(outflow_txid=outflow[0], outflow_idx=outflow[1])
-                )
-        if balance < amount:
-            unspent = self.unspent_outflows(
-                address, limit=amount-balance, filter_pending=True
-            )
-            for txid, index, outflow in unspent:
-                balance += outflow.amount
-                t.add_inflow(Inflow(outflow_txid=txid, outflow_idx=index))
-        if balance < amount:
-            raise InsufficientFundsError()
+        balance = self.collect_inflows(t, outflows or ())
+        balance = self.collect_unspent_inflows(
+            t, address, amount, balance=balance
+        )
         t.add_outflow(Outflow(amount=amount, support=subject))
         if balance - amount:
             t.add_outflow(Outflow(amount=balance-amount, address=address))
@@ -418,8 +560,19 @@ class Chain:
     def to_json(self):
         return json.dumps(self.to_dict())
 
+    def cached_dao(self):
+        cached = self._dao_cache
+        if cached is None or cached[0] != self.block_hash:
+            return None
+        dao = cached[1]
+        if not inspect(dao).persistent or dao.block_hash != self.block_hash:
+            self._dao_cache = None
+            return None
+        return dao
+
     def to_dao(self, create=False):
-        dao = None
+        if (dao := self.cached_dao()) is not None:
+            return dao
         dao = ChainDAO.get(block_hash=self.block_hash)
         if dao is None and self.cid is not None:
             dao = ChainDAO.get(id=self.cid)
@@ -429,13 +582,18 @@ class Chain:
                 dao = None
         if not dao:
             dao = ChainDAO.get(block_hash=self.block_hash)
-        if not dao and create:
+        if dao:
+            self._dao_cache = (self.block_hash, dao)
+        elif create:
             dao = ChainDAO(self.block_hash)
         return dao
 
-    def to_db(self):
+    def to_db(self, commit=True):
         dao = self.to_dao(create=True)
-        dao.commit()
+        if commit:
+            dao.commit()
+        else:
+            dao.flush()
         self.cid = dao.id
 
     def __lt__(self, other):
@@ -1,35 +1,26 @@
 import os
+import queue
+import threading
 from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
 from http.client import responses
+from itertools import islice
+from time import monotonic
 
 import click
+import orjson
 import requests
 from flask import current_app
 from flask.cli import AppGroup, with_appcontext
-from humanfriendly import format_timespan
-from millify import millify
-from rich.live import Live
-from rich.panel import Panel
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TaskProgressColumn,
-    TextColumn,
-    TimeElapsedColumn,
-    TimeRemainingColumn,
-)
-from rich.prompt import Confirm
-from rich.rule import Rule
-from rich.table import Table
-from rich.text import Text
 
-from cancelchain.api_client import ApiClient
+from cancelchain.api_client import ApiClient, create_session
 from cancelchain.block import Block
-from cancelchain.chain import CURMUDGEON_PER_GRUMBLE
-from cancelchain.console import console
+from cancelchain.chain import CURMUDGEON_PER_GRUMBLE, prefetch_txns
+from cancelchain.console import console, print_line
 from cancelchain.database import db
 from cancelchain.miller import Miller
+from cancelchain.models import BlockDAO, ChainDAO, rollback_session
 from cancelchain.node import Node
 from cancelchain.payload import encode_subject
 from cancelchain.transaction import Transaction
@@ -37,10 +28,21 @@ from cancelchain.util import host_address, now_iso
 from cancelchain.wallet import Wallet
 
 REFRESH_PER_SECOND = 8
+FLUSH_SECONDS = 1 / REFRESH_PER_SECOND
+FLUSH_STEPS = 1000
+READ_CHUNK_SIZE = 1 << 20
+COUNT_LINES_MAX_SIZE = 256 << 20
+TAIL_CHUNK_SIZE = 1 << 16
+WRITE_BUFFER_SIZE = 1 << 20
+EXPORT_BATCH_SIZE = 512
+IMPORT_BATCH_SIZE = 500
+PREFETCH_QUEUE_SIZE = 256
 CHAIN_MISMATCH_MSG = 'Chain/file mismatch'
+BIGNUM_UNITS = ('', 'k', 'M', 'B', 'T', 'P', 'E', 'Z', 'Y')
+
 
 def grumble_to_curmudgeons(grumble):
-    return int(CURMUDGEON_PER_GRUMBLE * float(grumble))
+    return int(Decimal(str(grumble)) * CURMUDGEON_PER_GRUMBLE)
 
 
 def human_curmudgeons(curmudgeons):
@@ -49,16 +51,24 @@ def human_curmudgeons(curmudgeons):
 
 
 def human_bignum(num):
-    return millify(num, precision=2, drop_nulls=False)
+    num = float(num)
+    i = 0
+    while abs(num) >= 1000 and i < len(BIGNUM_UNITS) - 1:
+        num /= 1000
+        i += 1
+    return f'{num:.2f}{BIGNUM_UNITS[i]}'
 
 
 def human_timespan(secs):
+    from humanfriendly import format_timespan
     return format_timespan(secs)
 
 
 def http_error_message(e):
     try:
-        msg = e.response.json().get('error')
+        if 'json' not in e.response.headers.get('Content-Type', ''):
+            return responses.get(e.response.status_code)
+        msg = orjson.loads(e.response.content).get('error')
         if msg:
             if isinstance(msg, dict):
                 return ','.join([f"{k} => {v}" for k, v in msg.items()])
@@ -68,10 +78,15 @@ def http_error_message(e):
                 return msg
         else:
             return e.response.text
-    except (AttributeError, requests.exceptions.JSONDecodeError):
+    except (AttributeError, orjson.JSONDecodeError):
         return responses.get(e.response.status_code)
 
 
+@lru_cache(maxsize=1)
+def command_session():
+    return create_session()
+
+
 def host_api_client(host=None, wallet_file=None):
     if not host:
         host = current_app.config.get('DEFAULT_COMMAND_HOST')
@@ -80,9 +95,14 @@ def host_api_client(host=None, wallet_file=None):
     else:
         host, address = host_address(host)
         wallet = current_app.wallets.get(address)
-    return ApiClient(
-        host, wallet, timeout=current_app.config.get('API_CLIENT_TIMEOUT')
-    )
+    key = (host, wallet.address if wallet is not None else None)
+    if (client := current_app.command_clients.get(key)) is None:
+        client = current_app.command_clients[key] = ApiClient(
+            host, wallet,
+            timeout=current_app.config.get('API_CLIENT_TIMEOUT'),
+            session=command_session()
+        )
+    return client
 
 
 def address_wallet(address, wallet_file=None):
@@ -96,19 +116,120 @@ def address_wallet(address, wallet_file=None):
     return wallet
 
 
+def count_lines(file):
+    count = 0
+    last = b'\n'
+    with open(file, 'rb', buffering=0) as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            count += chunk.count(b'\n')
+            last = chunk[-1:]
+    return count if last == b'\n' else count + 1
+
+
 def read_last_line(file):
     with open(file, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        chunk_size = TAIL_CHUNK_SIZE
+        while True:
+            start = max(0, size - chunk_size)
+            f.seek(start)
+            data = f.read()
+            end = len(data) - 1 if data.endswith(b'\n') else len(data)
+            if (nl := data.rfind(b'\n', 0, end)) >= 0 or start == 0:
+                return data[nl+1:].decode()
+            chunk_size *= 2
+
+
+def prefetch_block_lines(app, chain_id, idx):
+    """Yield encoded block lines from idx, fetched on a producer thread."""
+    lines = queue.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+    done = object()
+    stop = threading.Event()
+
+    def produce():
         try:
-            f.seek(-2, os.SEEK_END)
-            while f.read(1) != b'\n':
-                f.seek(-2, os.SEEK_CUR)
-        except OSError:  # catch OSError in case of one line file
-            f.seek(0)
-        return f.readline().decode()
+            with app.app_context():
+                chain_dao = db.session.get(ChainDAO, chain_id)
+                blocks = prefetch_txns(
+                    Block.from_dao(block_dao)
+                    for block_dao in chain_dao.blocks_from(idx)
+                )
+                for block in blocks:
+                    if stop.is_set():
+                        break
+                    lines.put(orjson.dumps(
+                        block.to_dict(), option=orjson.OPT_APPEND_NEWLINE
+                    ))
+        except Exception as e:
+            lines.put(e)
+        finally:
+            lines.put(done)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while (line := lines.get()) is not done:
+            if isinstance(line, Exception):
+                raise line
+            yield line
+    finally:
+        stop.set()
+        while producer.is_alive():
+            try:
+                lines.get_nowait()
+            except queue.Empty:
+                producer.join(timeout=FLUSH_SECONDS)
 
 
-class ProgressBar:
+class ThrottledProgress:
+    flush_every = 1
+    _pending = 0
+    _last_flush = float('-inf')
+
+    @property
+    def console(self):
+        return self.live.console
+
+    def advance(self, n):
+        self.progress.advance(self.task_id, advance=n)
+
+    def next(self, n=1):
+        self._pending += n
+        if (
+            self._pending >= self.flush_every or
+            monotonic() - self._last_flush >= FLUSH_SECONDS
+        ):
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.advance(self._pending)
+            self._pending = 0
+        self._last_flush = monotonic()
+
+    def __enter__(self):
+        self.live.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+        self.live.__exit__(exc_type, exc_val, exc_tb)
+
+
+class ProgressBar(ThrottledProgress):
     def __init__(self, title, console=None, total=None, completed=0):
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.progress import (
+            BarColumn,
+            Progress,
+            TaskProgressColumn,
+            TextColumn,
+            TimeElapsedColumn,
+            TimeRemainingColumn,
+        )
+        if total:
+            self.flush_every = max(1, total // FLUSH_STEPS)
         self.progress = Progress(
             BarColumn(),
             TextColumn('{task.completed}/{task.total}'),
@@ -132,23 +253,22 @@ class ProgressBar:
             refresh_per_second=REFRESH_PER_SECOND
         )
 
-    @property
-    def console(self):
-        return self.live.console
-
-    def next(self, n=1):
-        self.progress.advance(self.task_id, advance=n)
-
-    def __enter__(self):
-        self.live.__enter__()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.live.__exit__(exc_type, exc_val, exc_tb)
-
 
-class BlockSyncProgress:
+class BlockSyncProgress(ThrottledProgress):
     def __init__(self, peer=None, console=None):
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.progress import (
+            BarColumn,
+            Progress,
+            SpinnerColumn,
+            TaskProgressColumn,
+            TextColumn,
+            TimeElapsedColumn,
+            TimeRemainingColumn,
+        )
+        from rich.rule import Rule
+        from rich.table import Table
         self.find_progress = Progress(
             SpinnerColumn(spinner_name='aesthetic', style='none'),
             TextColumn('{task.completed} Blocks'),
@@ -194,14 +314,8 @@ class BlockSyncProgress:
             Rule(title=f'Synchronizing with peer [bold]{peer}', align='left')
         )
 
-    @property
-    def console(self):
-        return self.live.console
-
-    def next(self, n=1):
-        self.progress.advance(self.task_id, advance=n)
-
     def complete_find(self):
+        self.flush()
         block_count = self.find_progress.tasks[0].completed
         self.find_progress.update(
             self.find_task_id, total=block_count
@@ -221,18 +335,23 @@ class BlockSyncProgress:
     def finish(self):
         self.complete_find()
 
-    def __enter__(self):
-        self.live.__enter__()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.live.__exit__(exc_type, exc_val, exc_tb)
 
-
-class MillingProgress:
+class MillingProgress(ThrottledProgress):
     def __init__(self, console=None):
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.progress import (
+            Progress,
+            SpinnerColumn,
+            TextColumn,
+            TimeElapsedColumn,
+        )
         self.block = None
         self.chain = None
+        self.hashes = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.sampler = None
         self.progress = Progress(
             SpinnerColumn(spinner_name='aesthetic', style='milling'),
             TextColumn('{task.fields[hash_count]}h @'),
@@ -267,35 +386,49 @@ class MillingProgress:
         else:
             return human_bignum(0)
 
-    @property
-    def console(self):
-        return self.live.console
-
     @property
     def elapsed(self):
+        from rich.text import Text
         if self.task.elapsed is None:
             return Text("-:--:--", style="progress.elapsed")
         delta = timedelta(seconds=int(self.task.elapsed))
         return Text(str(delta), style="progress.elapsed")
 
     def next(self, n=1):
-        self.progress.update(
-            self.task_id, advance=n, hash_count=self.hash_count, hps=self.hps
-        )
+        self.hashes += n
+
+    def flush(self):
+        with self.lock:
+            self.progress.update(self.task_id, completed=self.hashes)
+            self.progress.update(
+                self.task_id, hash_count=self.hash_count, hps=self.hps
+            )
+
+    def sample(self):
+        while not self.stopped.wait(FLUSH_SECONDS):
+            self.flush()
 
     def next_block(self, block, chain):
-        self.block = block
-        self.chain = chain
-        self.progress.reset(self.task_id)
+        with self.lock:
+            self.block = block
+            self.chain = chain
+            self.hashes = 0
+            self.progress.reset(self.task_id)
 
     def __enter__(self):
-        self.live.__enter__()
+        super().__enter__()
+        self.stopped.clear()
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.live.__exit__(exc_type, exc_val, exc_tb)
+        self.stopped.set()
+        self.sampler.join()
+        super().__exit__(exc_type, exc_val, exc_tb)
 
     def print_start(self):
+        from rich.table import Table
         start_table = Table(show_header=False, border_style='milling')
         start_table.add_column('key', justify='right')
         start_table.add_column('value', justify='left')
@@ -308,6 +441,10 @@ class MillingProgress:
         self.console.print(start_table)
 
     def print_stop(self, milled_block):
+        from rich.rule import Rule
+        from rich.table import Table
+        from rich.text import Text
+        self.flush()
         stop_table = Table(show_header=False)
         stop_table.add_column('key', justify='right')
         stop_table.add_column('value', justify='left')
@@ -353,11 +490,12 @@ def init_db_command():
 @with_appcontext
 def sync_blocks_command():
     try:
+        app = current_app._get_current_object()
         node = Node(
-            host=current_app.config['NODE_HOST'],
-            peers=current_app.config['PEERS'],
-            clients=current_app.clients,
-            logger=current_app.logger
+            host=app.config['NODE_HOST'],
+            peers=app.config['PEERS'],
+            clients=app.clients,
+            logger=app.logger
         )
         for latest_block, peer in node.request_latest_blocks():
             try:
@@ -421,20 +559,36 @@ def export_blocks_command(file):
             completed=last_block.idx+1 if last_block is not None else 0
         )
         with open(
-            file, 'a' if append_blocks else 'w', encoding='utf-8'
+            file, 'ab' if append_blocks else 'wb', buffering=WRITE_BUFFER_SIZE
         ) as f, progress_bar as progress:
-            block_dao = lc_dao.get_block(idx=last_idx+1)
-            while block_dao is not None:
-                block = Block.from_dao(block_dao)
-                f.write(block.to_json())
-                f.write('\n')
-                progress.next()
-                block_dao = lc_dao.next_block(block_dao)
+            lines = []
+            for line in prefetch_block_lines(
+                current_app._get_current_object(), lc_dao.id, last_idx+1
+            ):
+                lines.append(line)
+                if len(lines) >= EXPORT_BATCH_SIZE:
+                    f.writelines(lines)
+                    progress.next(n=len(lines))
+                    lines = []
+            f.writelines(lines)
+            progress.next(n=len(lines))
     except Exception:
         console.print_exception()
         console.print('Export failed', style='error')
 
 
+def import_blocks(node, blocks):
+    try:
+        for block in blocks:
+            node.add_block(block, commit=False)
+        db.session.commit()
+    except Exception:
+        # Replay block by block so the blocks before a failure are kept.
+        rollback_session()
+        for block in blocks:
+            node.add_block(block)
+
+
 @click.command('import')
 @click.argument('file', type=click.Path(exists=True))
 @with_appcontext
@@ -446,18 +600,27 @@ def import_blocks_command(file):
     """
     try:
         node = Node(logger=current_app.logger)
-        with open(file, encoding='utf-8') as f:
-            progress_bar = ProgressBar(
-                "Importing Blocks",
-                console=console,
-                total=sum(1 for line in f)
-            )
+        total = None
+        if os.stat(file).st_size <= COUNT_LINES_MAX_SIZE:
+            total = count_lines(file)
+        progress_bar = ProgressBar(
+            "Importing Blocks",
+            console=console,
+            total=total
+        )
         with open(file, encoding='utf-8') as f, progress_bar as progress:
-            for line in f:
-                block = Block.from_json(line)
-                if Block.from_db(block.block_hash) is None:
-                    node.add_block(block)
-                progress.next()
+            while lines := list(islice(f, IMPORT_BATCH_SIZE)):
+                blocks = [Block.from_json(line) for line in lines]
+                existing = BlockDAO.existing_hashes(
+                    block.block_hash for block in blocks
+                )
+                new_blocks = []
+                for block in blocks:
+                    if block.block_hash not in existing:
+                        existing.add(block.block_hash)
+                        new_blocks.append(block)
+                import_blocks(node, new_blocks)
+                progress.next(n=len(blocks))
     except Exception:
         console.print_exception()
         console.print('Import failed', style='error')
@@ -510,15 +673,16 @@ def mill_command(address, multi, rounds, worksize, wallet, peer, blocks):
     \b
     ADDRESS is the address to use for milling coinbase rewards.
     """
+    app = current_app._get_current_object()
     milling_wallet = address_wallet(address, wallet_file=wallet)
-    if peer is not None and current_app.clients.get(peer) is None:
+    if peer is not None and app.clients.get(peer) is None:
         msg = f"Peer {peer} client not configured."
         raise Exception(msg)
     miller = Miller(
-        host=current_app.config['NODE_HOST'],
-        peers=current_app.config['PEERS'],
-        clients=current_app.clients,
-        logger=current_app.logger,
+        host=app.config['NODE_HOST'],
+        peers=app.config['PEERS'],
+        clients=app.clients,
+        logger=app.logger,
         milling_wallet=milling_wallet,
         milling_peer=peer
     )
@@ -531,6 +695,8 @@ def mill_command(address, multi, rounds, worksize, wallet, peer, blocks):
         except Exception:
             console.print_exception()
             db.session.rollback()
+    from rich.rule import Rule
+    db.session.execute(db.select(1))  # open a pooled connection before Live
     block_count = 0
     milling_progress = MillingProgress(console=console)
     with milling_progress as progress:
@@ -564,6 +730,51 @@ def mill_command(address, multi, rounds, worksize, wallet, peer, blocks):
                 db.session.rollback()
 
 
+def sign_and_post(client, txn, txn_wallet, kind, yes=False):
+    if not yes:
+        from rich.prompt import Confirm
+        console.print(f'{kind} transaction created: {txn.txid}')
+        if not Confirm.ask('Do you want to sign and post the transaction?'):
+            return False
+    txn.set_wallet(txn_wallet)
+    txn.sign()
+    client.post_transaction(txn)
+    return True
+
+
+def txn_options(f):
+    for option in reversed([
+        click.option(
+            '-t', '--txn-wallet',
+            type=click.Path(exists=True),
+            default=None,
+            help='Wallet file to use for transaction source.'
+        ),
+        click.option(
+            '-h', '--host',
+            default=None,
+            help='The API host to use (default from app config).'
+        ),
+        click.option(
+            '-w', '--wallet',
+            type=click.Path(exists=True),
+            default=None,
+            help='Wallet file to use for API auth.'
+        ),
+        click.option(
+            '-y', '--yes',
+            is_flag=True,
+            default=False,
+            help=(
+                'Assume "yes" as answer to all prompts and run '
+                'non-interactively.'
+            )
+        ),
+    ]):
+        f = option(f)
+    return f
+
+
 txn_cli = AppGroup('txn', help='Command group to create transactions.')
 
 
@@ -571,29 +782,7 @@ txn_cli = AppGroup('txn', help='Command group to create transactions.')
 @click.argument('from_address')
 @click.argument('amount', type=click.FLOAT)
 @click.argument('to_address')
-@click.option(
-    '-t', '--txn-wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for transaction source.'
-)
-@click.option(
-    '-h', '--host',
-    default=None,
-    help='The API host to use (default from app config).'
-)
-@click.option(
-    '-w', '--wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for API auth.'
-)
-@click.option(
-    '-y', '--yes',
-    is_flag=True,
-    default=False,
-    help='Assume "yes" as answer to all prompts and run non-interactively.'
-)
+@txn_options
 @with_appcontext
 def create_transfer(
     from_address, amount, to_address, txn_wallet, host, wallet, yes
@@ -614,15 +803,7 @@ def create_transfer(
             to_address
         )
         txn = Transaction.from_json(r.text)
-        if not (confirm := yes):
-            console.print(f'Transfer transaction created: {txn.txid}')
-            confirm = Confirm.ask(
-                'Do you want to sign and post the transaction?'
-            )
-        if confirm:
-            txn.set_wallet(txn_wallet)
-            txn.sign()
-            client.post_transaction(txn)
+        if sign_and_post(client, txn, txn_wallet, 'Transfer', yes):
             console.print('Transfer created.', style='success')
         else:
             console.print('Transfer aborted.', style='error')
@@ -638,29 +819,7 @@ def create_transfer(
 @click.argument('address')
 @click.argument('amount', type=click.FLOAT)
 @click.argument('subject')
-@click.option(
-    '-t', '--txn-wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for transaction source.'
-)
-@click.option(
-    '-h', '--host',
-    default=None,
-    help='The API host to use (default from app config).'
-)
-@click.option(
-    '-w', '--wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for API auth.'
-)
-@click.option(
-    '-y', '--yes',
-    is_flag=True,
-    default=False,
-    help='Assume "yes" as answer to all prompts and run non-interactively.'
-)
+@txn_options
 @with_appcontext
 def create_subject(address, amount, subject, txn_wallet, host, wallet, yes):
     """Create a subject ("cancel") transaction.
@@ -677,15 +836,7 @@ def create_subject(address, amount, subject, txn_wallet, host, wallet, yes):
             txn_wallet.public_key_b64, grumble_to_curmudgeons(amount), subject
         )
         txn = Transaction.from_json(r.text)
-        if not (confirm := yes):
-            console.print(f'Subject transaction created: {txn.txid}')
-            confirm = Confirm.ask(
-                'Do you want to sign and post the transaction?'
-            )
-        if confirm:
-            txn.set_wallet(txn_wallet)
-            txn.sign()
-            client.post_transaction(txn)
+        if sign_and_post(client, txn, txn_wallet, 'Subject', yes):
             console.print(f'Subject created: {txn.txid}', style='success')
         else:
             console.print('Subject aborted.', style='error')
@@ -701,29 +852,7 @@ def create_subject(address, amount, subject, txn_wallet, host, wallet, yes):
 @click.argument('address')
 @click.argument('amount', type=click.FLOAT)
 @click.argument('subject')
-@click.option(
-    '-t', '--txn-wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for transaction source.'
-)
-@click.option(
-    '-h', '--host',
-    default=None,
-    help='The API host to use (default from app config).'
-)
-@click.option(
-    '-w', '--wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for API auth.'
-)
-@click.option(
-    '-y', '--yes',
-    is_flag=True,
-    default=False,
-    help='Assume "yes" as answer to all prompts and run non-interactively.'
-)
+@txn_options
 @with_appcontext
 def create_forgive(address, amount, subject, txn_wallet, host, wallet, yes):
     """Create a forgive transaction.
@@ -740,15 +869,7 @@ def create_forgive(address, amount, subject, txn_wallet, host, wallet, yes):
             txn_wallet.public_key_b64, grumble_to_curmudgeons(amount), subject
         )
         txn = Transaction.from_json(r.text)
-        if not (confirm := yes):
-            console.print(f'Subject transaction created: {txn.txid}')
-            confirm = Confirm.ask(
-                'Do you want to sign and post the transaction?'
-            )
-        if confirm:
-            txn.set_wallet(txn_wallet)
-            txn.sign()
-            client.post_transaction(txn)
+        if sign_and_post(client, txn, txn_wallet, 'Forgive', yes):
             console.print(f'Forgive created: {txn.txid}', style='success')
         else:
             console.print('Forgive aborted.', style='error')
@@ -764,29 +885,7 @@ def create_forgive(address, amount, subject, txn_wallet, host, wallet, yes):
 @click.argument('address')
 @click.argument('amount', type=click.FLOAT)
 @click.argument('subject')
-@click.option(
-    '-t', '--txn-wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for transaction source.'
-)
-@click.option(
-    '-h', '--host',
-    default=None,
-    help='The API host to use (default from app config).'
-)
-@click.option(
-    '-w', '--wallet',
-    type=click.Path(exists=True),
-    default=None,
-    help='Wallet file to use for API auth.'
-)
-@click.option(
-    '-y', '--yes',
-    is_flag=True,
-    default=False,
-    help='Assume "yes" as answer to all prompts and run non-interactively.'
-)
+@txn_options
 @with_appcontext
 def create_support(address, amount, subject, txn_wallet, host, wallet, yes):
     """Create a subject support transaction.
@@ -803,15 +902,7 @@ def create_support(address, amount, subject, txn_wallet, host, wallet, yes):
             txn_wallet.public_key_b64, grumble_to_curmudgeons(amount), subject
         )
         txn = Transaction.from_json(r.text)
-        if not (confirm := yes):
-            console.print(f'Support transaction created: {txn.txid}')
-            confirm = Confirm.ask(
-                'Do you want to sign and post the transaction?'
-            )
-        if confirm:
-            txn.set_wallet(txn_wallet)
-            txn.sign()
-            client.post_transaction(txn)
+        if sign_and_post(client, txn, txn_wallet, 'Support', yes):
             console.print(f'Support created: {txn.txid}', style='success')
         else:
             console.print('Support aborted.', style='error')
@@ -866,13 +957,13 @@ def wallet_balance(address, host, wallet):
         client = host_api_client(host=host, wallet_file=wallet)
         r = client.get_wallet_balance(address)
         balance = r.json().get('balance')
-        console.print(f'{human_curmudgeons(balance)} CCG', style='success')
+        print_line(f'{human_curmudgeons(balance)} CCG', style='success')
     except requests.HTTPError as e:
-        console.print(
+        print_line(
             f'Balance failed: {http_error_message(e)}', style='error'
         )
     except Exception as e:
-        console.print(f'Balance failed: {e}', style='error')
+        print_line(f'Balance failed: {e}', style='error')
 
 
 subject_cli = AppGroup('subject', help='Command group to work with subjects.')
@@ -903,13 +994,13 @@ def subject_balance(subject, host, wallet):
         client = host_api_client(host=host, wallet_file=wallet)
         r = client.get_subject_balance(encode_subject(subject))
         balance = r.json().get('balance')
-        console.print(f'{human_curmudgeons(balance)} CCG', style='success')
+        print_line(f'{human_curmudgeons(balance)} CCG', style='success')
     except requests.HTTPError as e:
-        console.print(
+        print_line(
             f'Subject balance failed: {http_error_message(e)}', style='error'
         )
     except Exception as e:
-        console.print(f'Subject balance failed: {e}', style='error')
+        print_line(f'Subject balance failed: {e}', style='error')
 
 
 @subject_cli.command('support')
@@ -936,10 +1027,10 @@ def support_balance(subject, host, wallet):
         client = host_api_client(host=host, wallet_file=wallet)
         r = client.get_subject_support(encode_subject(subject))
         support = r.json().get('support')
-        console.print(f'{human_curmudgeons(support)} CCG', style='success')
+        print_line(f'{human_curmudgeons(support)} CCG', style='success')
     except requests.HTTPError as e:
-        console.print(
+        print_line(
             f'Support balance failed: {http_error_message(e)}', style='error'
         )
     except Exception as e:
-        console.print(f'Support balance failed: {e}', style='error')
+        print_line(f'Support balance failed: {e}', style='error')
@@ -1,8 +1,12 @@
 import json
 import os
-from dataclasses import dataclass, field, fields
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
 from typing import ClassVar
 
+from flask import Config
+
 
 @dataclass
 class EnvironSettings:
@@ -33,9 +37,34 @@ class EnvAppSettings(EnvironSettings):
     PEERS: list[str] = field(default_factory=list)
     API_CLIENT_TIMEOUT: int = field(default=10)
     API_ASYNC_PROCESSING: bool = field(default=False)
+    API_SESSION_TOKENS: bool = field(default=False)
+    PROPAGATION_QUEUE: str = field(default=None)
     DEFAULT_COMMAND_HOST: str = field(default=None)
     WALLET_DIR: str = field(default=None)
     ADMIN_ADDRESSES: list[str] = field(default_factory=list)
     MILLER_ADDRESSES: list[str] = field(default_factory=list)
     TRANSACTOR_ADDRESSES: list[str] = field(default_factory=list)
     READER_ADDRESSES: list[str] = field(default_factory=list)
+
+
+@lru_cache(maxsize=1)
+def env_app_settings():
+    return EnvAppSettings.from_env()
+
+
+@lru_cache(maxsize=1)
+def env_config():
+    config = Config('')
+    config.from_prefixed_env()
+    config.from_mapping(asdict(env_app_settings()))
+    return config
+
+
+def clear_env_config():
+    """Drop the cached environment settings so the next app re-reads them."""
+    env_config.cache_clear()
+    env_app_settings.cache_clear()
+
+
+def load_env_config(app):
+    app.config.update(deepcopy(env_config()))
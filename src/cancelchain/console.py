@@ -1,3 +1,5 @@
+import sys
+
 from rich.console import Console
 from rich.theme import Theme
 
@@ -16,3 +18,10 @@ theme = Theme({
 })
 
 console = Console(theme=theme, highlight=False)
+
+
+def print_line(text, style=None):
+    if console.is_terminal:
+        console.print(text, style=style, markup=False)
+    else:
+        sys.stdout.write(f'{text}\n')
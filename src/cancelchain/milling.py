@@ -10,25 +10,31 @@ def mill_hash(data):
 
 
 def mill_hash_bin(data):
-    return mill_hash(data).digest()
+    if isinstance(data, str):
+        data = data.encode()
+    return sha256(sha512(data).digest()).digest()
 
 
 def mill_hash_str(data):
-    return mill_hash(data).hexdigest()
+    if isinstance(data, str):
+        data = data.encode()
+    return sha256(sha512(data).digest()).hexdigest()
 
 
 def mill_work(w):
-    work_start, work_stop, unproven_header, target = w
+    work_start, work_stop, prefix, target = w
+    midstate = sha512(prefix).copy
     for proof in range(work_start, work_stop):
-        h = mill_hash_str(f'{unproven_header}{proof}')
-        if int(h, 16) < target:
+        header_hash = midstate()
+        header_hash.update(b'%d' % proof)
+        if sha256(header_hash.digest()).digest() < target:
             return (proof, work_stop - proof)
     return (None, work_stop - work_start)
 
 
 def mill_block(block, rounds, worksize, progress_next):
-    target = int(block.target, 16)
-    unproven_header = block.unproven_header
+    target = bytes.fromhex(block.target)
+    prefix = block.unproven_header.encode()
     proof_of_work = None
     proof_start = 0
     r = range(rounds) if rounds else count()
@@ -37,7 +43,7 @@ def mill_block(block, rounds, worksize, progress_next):
             if proof_of_work is not None:
                 break
             proof, c = mill_work((
-                proof_start, proof_start + worksize, unproven_header, target
+                proof_start, proof_start + worksize, prefix, target
             ))
             progress_next(n=c)
             if proof is not None and proof_of_work is None:
@@ -46,35 +52,33 @@ def mill_block(block, rounds, worksize, progress_next):
         yield proof_of_work
 
 
-def work_generator(unproven_header, target, start, worksize, num):
+def work_generator(prefix, target, start, worksize, num):
     for i in range(num):
         work_start = start + (i * worksize)
-        yield (work_start, work_start + worksize, unproven_header, target)
+        yield (work_start, work_start + worksize, prefix, target)
 
 
 def mill_block_mp(block, rounds, worksize, progress_next):
     cpus = multiprocessing.cpu_count()
-    target = int(block.target, 16)
-    unproven_header = block.unproven_header
+    target = bytes.fromhex(block.target)
+    prefix = block.unproven_header.encode()
     proof_of_work = None
     proof_start = 0
     r = range(rounds) if rounds else count()
-    while proof_of_work is None:
-        for _i in r:
-            if proof_of_work is not None:
-                break
-            work = work_generator(
-                unproven_header, target, proof_start, worksize, cpus
-            )
-            with multiprocessing.Pool(cpus) as p:
-                imap = p.imap_unordered(mill_work, work)
-                for (proof, c) in imap:
+    with multiprocessing.Pool(cpus) as p:
+        while proof_of_work is None:
+            for _i in r:
+                if proof_of_work is not None:
+                    break
+                work = work_generator(
+                    prefix, target, proof_start, worksize, cpus
+                )
+                for (proof, c) in p.imap_unordered(mill_work, work):
                     progress_next(n=c)
                     if proof is not None and proof_of_work is None:
                         proof_of_work = proof
-            p.join()
-            proof_start += worksize * cpus
-        yield proof_of_work
+                proof_start += worksize * cpus
+            yield proof_of_work
 
 
 def milling_generator(
@@ -6,6 +6,8 @@ from passlib.hash import argon2, pbkdf2_sha256
 from cancelchain.database import db
 from cancelchain.wallet import Wallet
 
+ANCESTORS_BATCH_SIZE = 256
+
 
 def rollback_session():
     db.session.rollback()
@@ -61,6 +63,25 @@ class TransactionDAO(db.Model):
     def get(cls, txid):
         return cls.query.filter_by(txid=txid).one_or_none()
 
+    @classmethod
+    def get_many(cls, txids):
+        return {
+            dao.txid: dao
+            for dao in cls.query.filter(cls.txid.in_(set(txids)))
+        }
+
+    @classmethod
+    def block_transactions(cls, block_hashes):
+        q = db.session.query(BlockDAO.block_hash, cls).join(cls.blocks)
+        q = q.filter(BlockDAO.block_hash.in_(set(block_hashes)))
+        q = q.options(
+            db.selectinload(cls.inflows), db.selectinload(cls.outflows)
+        )
+        txn_daos = {}
+        for block_hash, dao in q.order_by(cls.timestamp, cls.txid):
+            txn_daos.setdefault(block_hash, []).append(dao)
+        return txn_daos
+
     @classmethod
     def transactions_chain(cls, block_chain):
         block_alias = db.aliased(BlockDAO, block_chain.subquery())
@@ -228,6 +249,19 @@ class BlockDAO(db.Model):
     def block_chain(self):
         return db.session.query(self._block_chain)
 
+    @property
+    def ancestors(self):
+        block_alias = db.aliased(BlockDAO, self.block_chain.subquery())
+        q = BlockDAO.query.join(block_alias, BlockDAO.id == block_alias.id)
+        q = q.filter(BlockDAO.id != self.id).order_by(BlockDAO.idx.desc())
+        return q.yield_per(ANCESTORS_BATCH_SIZE)
+
+    def chain_from(self, idx):
+        block_alias = db.aliased(BlockDAO, self.block_chain.subquery())
+        q = BlockDAO.query.join(block_alias, BlockDAO.id == block_alias.id)
+        q = q.filter(BlockDAO.idx >= idx).order_by(BlockDAO.idx)
+        return q.yield_per(ANCESTORS_BATCH_SIZE)
+
     @property
     def transactions_chain(self):
         return TransactionDAO.transactions_chain(self.block_chain)
@@ -244,6 +278,10 @@ class BlockDAO(db.Model):
         db.session.add(self)
         db.session.commit()
 
+    def flush(self):
+        db.session.add(self)
+        db.session.flush()
+
     def get_transaction_in_chain(self, txid):
         return self.transactions_chain.filter(
             TransactionDAO.txid == txid
@@ -274,6 +312,19 @@ class BlockDAO(db.Model):
             InflowDAO.outflow_idx == outflow_idx
         ).first() is not None else 0
 
+    def inflows_in_chain_counts(self, outflows):
+        # Maps each spent outflow to 1 (presence), like inflows_in_chain_count.
+        outflows = set(outflows)
+        if not outflows:
+            return {}
+        q = self.inflows_chain.filter(
+            db.tuple_(InflowDAO.outflow_txid, InflowDAO.outflow_idx).in_(
+                outflows
+            )
+        )
+        q = q.with_entities(InflowDAO.outflow_txid, InflowDAO.outflow_idx)
+        return dict.fromkeys(q.order_by(None).distinct(), 1)
+
     @classmethod
     def count(cls):
         return db.session.query(db.func.count(cls.id)).one_or_none()[0]
@@ -285,6 +336,13 @@ class BlockDAO(db.Model):
         ):
             yield r[0]
 
+    @classmethod
+    def existing_hashes(cls, block_hashes):
+        q = cls.query.with_entities(cls.block_hash)
+        return {
+            r[0] for r in q.filter(cls.block_hash.in_(set(block_hashes)))
+        }
+
     @classmethod
     def get(cls, block_hash=None, idx=None):
         q = cls.query
@@ -412,6 +470,9 @@ class ChainDAO(db.Model):
     def get_block(self, block_hash=None, idx=None):
         return self.block.get_block_in_chain(block_hash=block_hash, idx=idx)
 
+    def blocks_from(self, idx):
+        return self.block.chain_from(idx)
+
     def next_block(self, block):
         for next_block in block.next:
             if self.get_block(block_hash=next_block.block_hash) is not None:
@@ -428,6 +489,10 @@ class ChainDAO(db.Model):
         db.session.add(self)
         db.session.commit()
 
+    def flush(self):
+        db.session.add(self)
+        db.session.flush()
+
     @classmethod
     def count(cls):
         return db.session.query(db.func.count(cls.id)).one_or_none()[0]
@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 
 import requests
@@ -22,6 +23,8 @@ from cancelchain.signals import new_block as new_block_signal
 from cancelchain.transaction import PendingTxnSet, Transaction
 from cancelchain.util import host_address, now
 
+MAX_PEER_WORKERS = 16
+
 
 class Node:
     def __init__(self, host=None, peers=None, clients=None, logger=None):
@@ -36,22 +39,40 @@ class Node:
         longest = ChainDAO.longest()
         return Chain.from_dao(longest) if longest else None
 
+    def unvisited_peers(self, visited_hosts):
+        return [
+            peer for peer in self.peers
+            if host_address(peer)[0] not in visited_hosts
+        ]
+
+    def map_peers(self, func, peers):
+        def call(peer):
+            try:
+                return func(self.clients.get(peer))
+            except requests.RequestException as re:
+                self.logger.warning(re)
+            except Exception as e:
+                self.logger.exception(e)
+            return None
+
+        if len(peers) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(len(peers), MAX_PEER_WORKERS)
+            ) as executor:
+                return list(zip(peers, executor.map(call, peers)))
+        return [(peer, call(peer)) for peer in peers]
+
     def send_transaction(self, txn, visited_hosts=None):
         visited_hosts = visited_hosts or []
         if self.host:
             host, _ = host_address(self.host)
             visited_hosts.append(host)
-        for peer in self.peers:
-            host, address = host_address(peer)
-            if host not in visited_hosts:
-                try:
-                    self.clients.get(peer).post_transaction(
-                        txn, visited_hosts=visited_hosts
-                    )
-                except requests.RequestException as re:
-                    self.logger.warning(re)
-                except Exception as e:
-                    self.logger.exception(e)
+        self.map_peers(
+            lambda client: client.post_transaction(
+                txn, visited_hosts=visited_hosts
+            ),
+            self.unvisited_peers(visited_hosts)
+        )
 
     def receive_transaction(
         self, txid, txn_json, visited_hosts=None, process=True
@@ -84,21 +105,17 @@ class Node:
         if self.host:
             host, _ = host_address(self.host)
             visited_hosts.append(host)
-        for peer in self.peers:
-            host, address = host_address(peer)
-            if host not in visited_hosts:
-                try:
-                    r = self.clients.get(peer).post_block(
-                        block,
-                        visited_hosts=visited_hosts,
-                        raise_for_status=False
-                    )
-                    if r.status_code == 404:
-                        self.fill_peer(peer, block)
-                except requests.RequestException as re:
-                    self.logger.warning(re)
-                except Exception as e:
-                    self.logger.exception(e)
+        block_json = block.to_json().encode()
+        responses = self.map_peers(
+            lambda client: client.post_block(
+                block, visited_hosts=visited_hosts, raise_for_status=False,
+                block_json=block_json
+            ),
+            self.unvisited_peers(visited_hosts)
+        )
+        for peer, r in responses:
+            if r is not None and r.status_code == 404:
+                self.fill_peer(peer, block)
 
     def receive_block(
         self, block_json, block_hash=None, visited_hosts=None, process=True
@@ -126,26 +143,26 @@ class Node:
             self.send_block(block, visited_hosts=visited_hosts)
         return block
 
-    def add_block(self, block):
+    def add_block(self, block, commit=True):
         try:
             chain = Chain.from_db(block_hash=block.prev_hash)
             if chain:
-                chain.add_block(block)
+                chain.add_block(block, commit=commit)
             else:
-                chain = self.create_chain(block=block)
-            chain.to_db()
+                chain = self.create_chain(block=block, commit=commit)
+            chain.to_db(commit=commit)
         except SQLAlchemyError:
             rollback_session()
-            if not Block.from_db(block.block_hash):
+            if not commit or not Block.from_db(block.block_hash):
                 raise
             block = None
         return block
 
-    def create_chain(self, block=None):
+    def create_chain(self, block=None, commit=True):
         block_hash = block.prev_hash if block else None
         chain = Chain(block_hash=block_hash)
         if block:
-            chain.add_block(block)
+            chain.add_block(block, commit=commit)
         return chain
 
     def request_block(self, block_hash):
@@ -164,14 +181,12 @@ class Node:
 
     def request_latest_blocks(self, peer=None):
         peers = [peer] if peer is not None else self.peers
-        for peer in peers:
-            try:
-                r = self.clients.get(peer).get_block()
-                yield Block.from_json(r.text), peer
-            except requests.RequestException as re:
-                self.logger.error(re)
-            except Exception as e:
-                self.logger.exception(e)
+        latest_blocks = self.map_peers(
+            lambda client: Block.from_json(client.get_block().text), peers
+        )
+        for peer, block in latest_blocks:
+            if block is not None:
+                yield block, peer
 
     def fill_peer(self, peer, last_block):
         blocks = []
@@ -198,11 +213,13 @@ class Node:
             for block in blocks:
                 accepted = False
                 delay = 0
+                block_json = block.to_json().encode()
                 while not accepted:
                     r = client.post_block(
                         block,
                         visited_hosts=visited_hosts,
-                        raise_for_status=False
+                        raise_for_status=False,
+                        block_json=block_json
                     )
                     if r.status_code in [200, 201, 202]:
                         accepted = True
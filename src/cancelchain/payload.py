@@ -1,5 +1,6 @@
 from base64 import urlsafe_b64decode, urlsafe_b64encode
 from dataclasses import dataclass
+from functools import lru_cache
 
 from marshmallow import (
     ValidationError,
@@ -15,8 +16,10 @@ MIN_SUBJECT_LENGTH = 1
 MAX_SUBJECT_LENGTH = 79
 INVALID_DESTINATION_MSG = 'Invalid destinations'
 INVALID_PADDING_MSG = 'Invalid padding'
+SUBJECT_CACHE_SIZE = 4096
 
 
+@lru_cache(maxsize=SUBJECT_CACHE_SIZE)
 def encode_subject(raw_subject):
     return urlsafe_b64encode(raw_subject.encode()).rstrip(b'=').decode()
 
@@ -110,6 +113,16 @@ class Outflow:
     def mudita(self):
         return self.amount if self.support is not None else 0
 
+    @classmethod
+    def from_dao(cls, dao):
+        return cls(
+            amount=dao.amount,
+            address=dao.address,
+            subject=dao.subject,
+            forgive=dao.forgive,
+            support=dao.support
+        )
+
 
 class InflowSchema(SansNoneSchema):
     outflow_txid = MillHash(required=True)
@@ -1,4 +1,6 @@
+import re
 from dataclasses import asdict
+from functools import lru_cache
 
 from marshmallow import Schema, fields, post_dump, validate
 
@@ -11,6 +13,12 @@ from cancelchain.wallet import (
     b64encode,
 )
 
+ADDRESS_CACHE_SIZE = 4096
+MILL_HASH_RE = re.compile(
+    r'[A-Za-z0-9+/]{60}(?:[A-Za-z0-9+/]{4}|'
+    r'[A-Za-z0-9+/]{2}[AEIMQUYcgkosw048]=|[A-Za-z0-9+/][AQgw]==)'
+)
+
 
 def asdict_sans_none(dc):
     return asdict(
@@ -23,6 +31,7 @@ def validate_address(public_key_b64, address):
     return (wallet is not None) and address == wallet.address
 
 
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
 def validate_address_format(address):
     try:
         if (
@@ -46,6 +55,10 @@ def validate_base64(s):
     return False
 
 
+def validate_mill_hash(s):
+    return isinstance(s, str) and MILL_HASH_RE.fullmatch(s) is not None
+
+
 def validate_public_key(public_key_b64):
     wallet = Wallet(b64ks=public_key_b64)
     return wallet is not None and wallet.private_key is None
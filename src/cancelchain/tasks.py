@@ -1,7 +1,9 @@
-import requests
 from celery import Celery
 
+from cancelchain.api_client import create_session
+
 celery = Celery(__name__)
+session = create_session()
 
 
 def init_tasks(app):
@@ -18,7 +20,7 @@ def init_tasks(app):
 
 @celery.task()
 def post_process(url, data, headers=None):
-    r = requests.post(
+    r = session.post(
         url,
         headers=headers,
         data=data,
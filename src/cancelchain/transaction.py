@@ -1,7 +1,9 @@
 from collections.abc import MutableSet
 from dataclasses import dataclass, field
+from functools import total_ordering
 from json import JSONDecodeError
 
+import orjson
 from marshmallow import (
     ValidationError,
     fields,
@@ -93,7 +95,8 @@ class CoinbaseTransactionSchema(TransactionSchema):
     )
 
 
-@dataclass(order=True)
+@total_ordering
+@dataclass(eq=False)
 class Transaction:
     timestamp: str = field(default_factory=now_iso)
     txid: str = field(default=None)
@@ -104,6 +107,18 @@ class Transaction:
     outflows: list[Outflow] = field(default_factory=list, compare=False)
     version: str = field(default=VERSION_1, compare=False, repr=False)
 
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.timestamp == other.timestamp and self.txid == other.txid
+
+    def __lt__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        if self.timestamp != other.timestamp:
+            return self.timestamp < other.timestamp
+        return self.txid != other.txid and self.txid < other.txid
+
     @property
     def timestamp_dt(self):
         return iso_2_dt(self.timestamp) if self.timestamp else None
@@ -127,17 +142,26 @@ class Transaction:
     def signing_data(self):
         return ','.join([self.data_csv, self.txid]).encode()
 
+    @property
+    def totals(self):
+        schadenfreude = grace = mudita = 0
+        for o in self.outflows:
+            schadenfreude += o.schadenfreude
+            grace += o.grace
+            mudita += o.mudita
+        return (schadenfreude, grace, mudita)
+
     @property
     def schadenfreude(self):
-        return sum([o.schadenfreude for o in self.outflows])
+        return self.totals[0]
 
     @property
     def grace(self):
-        return sum([o.grace for o in self.outflows])
+        return self.totals[1]
 
     @property
     def mudita(self):
-        return sum([o.mudita for o in self.outflows])
+        return self.totals[2]
 
     def set_wallet(self, wallet):
         self.wallet = wallet
@@ -241,7 +265,7 @@ class Transaction:
     @classmethod
     def from_json(cls, j):
         try:
-            return TransactionSchema().loads(j)
+            return TransactionSchema().load(orjson.loads(j))
         except JSONDecodeError as je:
             raise InvalidTransactionError(je.msg)
         except ValidationError as ve:
@@ -262,13 +286,7 @@ class Transaction:
                 ) for inflow_dao in dao.inflows
             ],
             outflows=[
-                Outflow(
-                    amount=outflow_dao.amount,
-                    address=outflow_dao.address,
-                    subject=outflow_dao.subject,
-                    forgive=outflow_dao.forgive,
-                    support=outflow_dao.support
-                ) for outflow_dao in dao.outflows
+                Outflow.from_dao(outflow_dao) for outflow_dao in dao.outflows
             ],
             version=dao.version
         )
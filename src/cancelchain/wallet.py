@@ -1,6 +1,7 @@
 import json
 import os
 from base64 import standard_b64decode, standard_b64encode
+from functools import lru_cache
 
 import base58check
 import Crypto.Random
@@ -14,6 +15,7 @@ from cancelchain.milling import mill_hash_bin
 
 ADDRESS_TAG = 'CC'
 KEY_SIZE = 2048
+WALLET_CACHE_SIZE = 256
 
 
 def b58decode(s):
@@ -182,5 +184,21 @@ class Wallet:
 
     @classmethod
     def from_file(cls, filename, passphrase=None):
-        with open(filename, 'rb') as f:
-            return cls(ks=f.read(), passphrase=passphrase)
+        filename = os.path.abspath(filename)
+        if passphrase is not None:
+            # Encrypted wallets skip the cache so passphrases are not retained.
+            return read_wallet_file(filename, passphrase=passphrase)
+        st = os.stat(filename)
+        return read_cached_wallet_file(
+            filename, st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino
+        )
+
+
+def read_wallet_file(filename, passphrase=None):
+    with open(filename, 'rb') as f:
+        return Wallet(ks=f.read(), passphrase=passphrase)
+
+
+@lru_cache(maxsize=WALLET_CACHE_SIZE)
+def read_cached_wallet_file(filename, mtime_ns, ctime_ns, size, ino):
+    return read_wallet_file(filename)
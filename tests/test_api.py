@@ -1,14 +1,17 @@
+from unittest.mock import patch
 from urllib.parse import urljoin
 
+import jwt
 import pytest
 import requests
-from cancelchain.api import API_TOKEN_SECONDS
+from cancelchain.api import API_TOKEN_SECONDS, decode_token, handle_http_post
 from cancelchain.api_client import ApiClient
 from cancelchain.block import Block
 from cancelchain.miller import Miller
 from cancelchain.transaction import Transaction
 from cancelchain.util import now
 from cancelchain.wallet import Wallet
+from flask_caching.backends import SimpleCache
 
 TIMEOUT = 60
 
@@ -126,6 +129,31 @@ def test_expired_auth(
         assert response.status_code == requests.codes.ok
 
 
+def test_decode_token():
+    claims = {'sub': 'foo', 'rol': 'READER', 'exp': 1}
+    token = jwt.encode(claims, 'secret', algorithm='HS256')
+    assert decode_token(token, 'secret') == claims
+    with pytest.raises(jwt.exceptions.InvalidSignatureError):
+        decode_token(token, 'other')
+    with pytest.raises(jwt.exceptions.InvalidSignatureError):
+        decode_token(f'{token[:-2]}AA', 'secret')
+    with pytest.raises(jwt.exceptions.DecodeError):
+        decode_token('foo.bar', 'secret')
+    token = jwt.encode(claims, 'secret', algorithm='HS512')
+    with pytest.raises(jwt.exceptions.InvalidAlgorithmError):
+        decode_token(token, 'secret')
+
+
+def test_session_token(app, host, mill_block, requests_proxy, wallet):
+    app.config['API_SESSION_TOKENS'] = True
+    with app.app_context(), patch('cancelchain.api.cache', SimpleCache()):
+        _, b = mill_block(wallet)
+        client = ApiClient(host, wallet)
+        assert '.' not in client.get_token()
+        response = client.get_block()
+        assert Block.from_json(response.text) == b
+
+
 def test_last_block(app, host, mill_block, requests_proxy, wallet):
     with app.app_context():
         m, b = mill_block(wallet)
@@ -136,6 +164,23 @@ def test_last_block(app, host, mill_block, requests_proxy, wallet):
         assert request_block == m.longest_chain.last_block
 
 
+def test_block_not_modified(app, host, mill_block, requests_proxy, wallet):
+    with app.app_context():
+        _, b = mill_block(wallet)
+        client = ApiClient(host, wallet)
+        response = client.get_block()
+        assert response.headers['ETag'] == f'"{b.block_hash}"'
+        response = client.get(
+            '/api/block', headers={'If-None-Match': response.headers['ETag']}
+        )
+        assert response.status_code == requests.codes.not_modified
+        response = client.get(
+            f'/api/wallet/{wallet.address}/balance',
+            headers={'If-None-Match': f'"{b.block_hash}"'}
+        )
+        assert response.status_code == requests.codes.not_modified
+
+
 def test_get_invalid_block(app, host, mill_block, requests_proxy, wallet):
     with app.app_context():
         m, b = mill_block(wallet)
@@ -225,3 +270,25 @@ def test_pending_transactions(
         )
         assert response.status_code == requests.codes.ok
         assert response.json() == []
+
+
+@patch('cancelchain.api.group')
+@patch('cancelchain.api.post_process')
+def test_batched_http_posts(post_process, celery_group, app):
+    app.config['CELERY_BROKER_URL'] = 'memory://'
+    app.config['PROPAGATION_QUEUE'] = 'propagation'
+    with app.test_request_context('/api/block'):
+        handle_http_post(app, url='a', data='1')
+    post_process.apply_async.assert_called_once_with(
+        ('a', '1'), {'headers': None}, queue='propagation'
+    )
+    post_process.reset_mock()
+    with app.test_request_context('/api/block'):
+        handle_http_post(app, url='a', data='1')
+        handle_http_post(app, url='b', data='2')
+        post_process.s.assert_not_called()
+    post_process.apply_async.assert_not_called()
+    assert post_process.s.call_count == 2
+    celery_group.return_value.apply_async.assert_called_once_with(
+        queue='propagation'
+    )
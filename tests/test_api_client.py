@@ -43,3 +43,18 @@ def test_expired_token(
         m2.mill_block(b)
         response = client.post_block(b)
         assert response.status_code == requests.codes.ok
+
+
+def test_token_refresh(app, host, mill_block, requests_proxy, wallet):
+    with app.app_context():
+        client = ApiClient(host, wallet)
+        client.get_token()
+        refresh_at = client.token_refresh_at
+        client.get_token()
+        assert client.token_refresh_at == refresh_at
+        client.token_refresh_at = 0
+        client.get_token()
+        assert client.token_refresh_at >= refresh_at
+        mill_block(wallet)
+        response = client.get_block()
+        assert response.status_code == requests.codes.ok
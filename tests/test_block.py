@@ -1,11 +1,23 @@
 import datetime
+from hashlib import sha256
+from unittest.mock import patch
 
 import pytest
-from cancelchain.block import MAX_TRANSACTIONS, TXN_TIMEOUT, Block
+from cancelchain.block import (
+    MAX_TRANSACTIONS,
+    TXN_TIMEOUT,
+    Block,
+    merkle_path,
+    merkle_root,
+    validate_hash_diff,
+    validate_txns,
+    verify_merkle_path,
+)
 from cancelchain.chain import GENESIS_HASH
 from cancelchain.exceptions import (
     ExpiredTransactionError,
     InvalidBlockError,
+    InvalidSignatureError,
     MissingCoinbaseError,
     OutOfOrderTransactionError,
     SealedBlockError,
@@ -28,6 +40,70 @@ def new_txn(txid, subject, wallet):
     return txn
 
 
+@pytest.mark.parametrize('block_hash,target', [
+    ('0' * 64, 'F' * 64),
+    ('F' * 64, 'F' * 64),
+    ('0' * 6 + 'F' * 58, '0' * 6 + 'F' * 58),
+    ('0' * 6 + 'E' * 58, '0' * 6 + 'F' * 58),
+    ('1' + '0' * 63, '0' * 6 + 'F' * 58),
+    ('0' * 64, 'FF'),
+])
+def test_validate_hash_diff(block_hash, target):
+    assert validate_hash_diff(block_hash, target) == (
+        int(block_hash, 16) < int(target, 16)
+    )
+
+
+@pytest.mark.parametrize('size,root', [
+    (0, None),
+    (1, 'c79d67e1e905e2497efc4b42d08695c65380bff61a5838eeca2c784663a0842b'),
+    (2, 'd8413a11fa2ca1a96b856cb71a8073a871911bfbae4251ef0b7c7e7a8fd66c8b'),
+    (3, '75191f5e70e790abb5ec9fd85c3d5f217e1742896ecc37b2843bfcb4a9e46cb6'),
+    (5, 'd8248e3461de99e6adf84d0936192763f1e3ad01c894b86bc508dd672ead12d0'),
+    (8, '21822d2e0fad417b00a5e401c89d8254219d8bf92f7d78209f29030fd8b5456f'),
+    (13, 'b2975a528d8546abf2ab18276c984364588743a5a4a6c6ec4eeb77249c4f71cd'),
+])
+def test_merkle_root(size, root):
+    txids = [sha256(str(i).encode()).hexdigest() for i in range(size)]
+    assert merkle_root(txids) == root
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 8, 13])
+def test_merkle_path(size):
+    txids = [sha256(str(i).encode()).hexdigest() for i in range(size)]
+    root = merkle_root(txids)
+    for idx, txid in enumerate(txids):
+        path = merkle_path(txids, idx)
+        assert verify_merkle_path(txid, path, root)
+        assert not verify_merkle_path(GENESIS_HASH, path, root)
+
+
+@patch('cancelchain.block.TXN_VALIDATION_WORKERS', 4)
+def test_validate_txns(subject, txid, wallet):
+    txns = [new_txn(txid, subject, wallet) for _ in range(3)]
+    for txn, validate_txn in validate_txns(txns):
+        assert txn in txns
+        validate_txn()
+    txns[1].outflows[0].amount += 1
+    validated = validate_txns(txns)
+    txn, validate_txn = next(validated)
+    validate_txn()
+    txn, validate_txn = next(validated)
+    assert txn is txns[1]
+    with pytest.raises(InvalidSignatureError):
+        validate_txn()
+
+
+def test_inflow_index(subject, txid, wallet):
+    block = Block()
+    assert block.inflow_index == {}
+    block.txns = [new_txn(txid, subject, wallet) for _ in range(2)]
+    assert block.inflow_index == {(txid, 0): 2}
+    block.txns.append(new_txn(txid, subject, wallet))
+    assert block.inflow_index[(txid, 0)] == 3
+    assert block.inflow_index[(txid, 1)] == 0
+
+
 def test_from(reward, valid_block, wallet):
     valid_block.link(0, GENESIS_HASH, TEST_TARGET)
     valid_block.seal(wallet, reward)
@@ -67,12 +143,43 @@ def test_valid(reward, valid_block, single_txn, wallet):
         valid_block.add_txn(single_txn)
 
 
+def test_cached_hashes(
+    reward, single_block, subject, time_machine, txid, wallet
+):
+    single_block.link(0, GENESIS_HASH, TEST_TARGET)
+    merkle_root = single_block.get_merkle_root()
+    assert single_block.get_merkle_root() == merkle_root
+    time_machine.move_to(now() + datetime.timedelta(minutes=1))
+    single_block.add_txn(new_txn(txid, subject, wallet))
+    assert single_block.get_merkle_root() != merkle_root
+    single_block.seal(wallet, reward)
+    single_block.mill()
+    header_hash = single_block.get_header_hash()
+    assert header_hash == single_block.block_hash
+    single_block.proof_of_work += 1
+    assert single_block.get_header_hash() != header_hash
+
+
 def test_in_merkle_tree(reward, single_block, single_txn, wallet):
     single_block.link(0, GENESIS_HASH, TEST_TARGET)
     single_block.seal(wallet, reward)
     single_block.mill()
     single_block.validate()
     assert single_block.in_merkle_tree(single_txn.txid)
+    assert not single_block.in_merkle_tree(single_block.block_hash)
+
+
+def test_validate_cached(reward, single_block, wallet):
+    single_block.link(0, GENESIS_HASH, TEST_TARGET)
+    single_block.seal(wallet, reward)
+    single_block.mill()
+    single_block.validate()
+    with patch.object(Block, 'validate_merkle_root') as validate_merkle_root:
+        single_block.validate()
+        validate_merkle_root.assert_not_called()
+    single_block.merkle_root = None
+    with pytest.raises(InvalidBlockError, match="merkle_root"):
+        single_block.validate()
 
 
 def test_add_txn(single_block, subject, time_machine, txid, wallet):
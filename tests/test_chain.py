@@ -8,6 +8,8 @@ from cancelchain.chain import (
     GENESIS_HASH,
     REWARD,
     Chain,
+    is_balanced,
+    prefetch_txns,
 )
 from cancelchain.exceptions import (
     FutureBlockError,
@@ -30,6 +32,19 @@ from cancelchain.wallet import Wallet
 TEST_TARGET = 'F' * 64
 
 
+@pytest.mark.parametrize('inflow_amounts,outflows,balanced', [
+    ([(10, None)], [Outflow(amount=10, address='a')], True),
+    ([(10, None)], [Outflow(amount=9, address='a')], False),
+    ([(10, 's')], [Outflow(amount=10, forgive='s')], True),
+    ([(10, 's')], [Outflow(amount=10, address='a')], False),
+    ([(10, 's'), (5, None)], [Outflow(amount=15, subject='s')], True),
+    ([(10, None)], [Outflow(amount=10, subject='s')], True),
+    ([(10, 's')], [Outflow(amount=4, subject='s')], False),
+])
+def test_is_balanced(inflow_amounts, outflows, balanced):
+    assert is_balanced(inflow_amounts, outflows) == balanced
+
+
 def test_from(valid_chain):
     d = valid_chain.to_dict()
     new_chain = Chain.from_dict(d)
@@ -51,6 +66,101 @@ def test_valid(add_chain_block, app, wallet):
         chain.validate()
 
 
+def test_cached_last_block(app, wallet):
+    with app.app_context():
+        chain = Chain()
+        assert chain.last_block is None
+        block = Block()
+        chain.link_block(block)
+        chain.seal_block(block, wallet)
+        block.mill()
+        chain.add_block(block)
+        last_block = chain.last_block
+        assert last_block == block
+        assert chain.last_block is last_block
+        assert chain.target == chain.block_target()
+
+
+def test_cached_dao(add_chain_block, app):
+    with app.app_context():
+        chain, _ = add_chain_block()
+        chain.to_db()
+        dao = chain.to_dao()
+        assert dao.block_hash == chain.block_hash
+        assert chain.to_dao() is dao
+        _, block = add_chain_block(chain=chain)
+        chain.to_db()
+        assert chain.to_dao() is dao
+        assert chain.to_dao().block_hash == block.block_hash
+
+
+def test_block_index(add_chain_block, app):
+    with app.app_context():
+        chain, block_1 = add_chain_block()
+        _, block_2 = add_chain_block(chain=chain)
+        _, block_3 = add_chain_block(chain=chain)
+        assert chain.block_index == {
+            0: block_1.block_hash,
+            1: block_2.block_hash,
+            2: block_3.block_hash,
+        }
+        assert chain.get_block_by_reverse_index(2) == block_1
+        chain.block_hash = block_2.block_hash
+        assert chain.block_index == {}
+        assert chain.get_block_by_reverse_index(1) == block_1
+        assert chain.block_index == {
+            0: block_1.block_hash,
+            1: block_2.block_hash,
+        }
+
+
+def test_prefetch_txns(add_chain_block, app):
+    with app.app_context():
+        chain, block_1 = add_chain_block()
+        _, block_2 = add_chain_block(chain=chain)
+        _, block_3 = add_chain_block(chain=chain)
+        blocks = list(prefetch_txns(chain.blocks, size=2))
+        assert blocks == [block_3, block_2, block_1]
+        assert [b.txns for b in blocks] == [
+            block_3.txns, block_2.txns, block_1.txns
+        ]
+        chain.validate()
+
+
+def test_prefetch_txns_errors(add_chain_block, app):
+    with app.app_context():
+        chain, block_1 = add_chain_block()
+        _, block_2 = add_chain_block(chain=chain)
+        _, block_3 = add_chain_block(chain=chain)
+
+        def failing_blocks():
+            yield from [block_3, block_2]
+            raise RuntimeError('upstream')
+
+        received = []
+        with pytest.raises(RuntimeError, match='upstream'):
+            for block in prefetch_txns(failing_blocks(), size=3):
+                received.append(block)
+        assert received == [block_3, block_2]
+
+        from_dao = Transaction.from_dao
+        calls = []
+
+        def failing_from_dao(dao):
+            calls.append(dao)
+            if len(calls) > 1:
+                raise RuntimeError('load')
+            return from_dao(dao)
+
+        received = []
+        with patch(
+            'cancelchain.chain.Transaction.from_dao', failing_from_dao
+        ), pytest.raises(RuntimeError, match='load'):
+            for block in prefetch_txns(chain.blocks, size=3):
+                received.append(block.block_hash)
+        assert received == [block_3.block_hash]
+
+
 def test_invalid_prev_hash(app, wallet):
     with app.app_context():
         chain = Chain()
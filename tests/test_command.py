@@ -1,7 +1,15 @@
 import os
 from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest.mock import patch
 
 from cancelchain.chain import CURMUDGEON_PER_GRUMBLE, REWARD
+from cancelchain.command import (
+    ProgressBar,
+    count_lines,
+    grumble_to_curmudgeons,
+    human_bignum,
+    read_last_line,
+)
 from cancelchain.wallet import Wallet
 
 REWARD_CCG = int(REWARD / CURMUDGEON_PER_GRUMBLE)
@@ -17,6 +25,65 @@ def get_wallet_file(address, walletdir=None, app=None):
     return fn
 
 
+@patch('cancelchain.command.monotonic', lambda: 0.0)
+@patch('cancelchain.command.FLUSH_SECONDS', 3600)
+def test_progress_bar_throttled():
+    progress_bar = ProgressBar('Test', total=10000)
+    assert progress_bar.flush_every == 10
+    task = progress_bar.progress.tasks[0]
+    with progress_bar as progress:
+        progress.next()
+        assert task.completed == 1
+        for _ in range(8):
+            progress.next()
+        assert task.completed == 1
+        progress.next(n=2)
+        assert task.completed == 11
+        progress.next()
+    assert task.completed == 12
+
+
+@patch('cancelchain.command.READ_CHUNK_SIZE', 4)
+def test_count_lines():
+    with TemporaryDirectory() as tmpdir:
+        fn = os.path.join(tmpdir, 'lines.txt')
+        for content, count in [
+            (b'', 0), (b'a', 1), (b'a\n', 1), (b'abc\ndef', 2),
+            (b'abc\ndef\n', 2), (b'\n\n\n', 3)
+        ]:
+            with open(fn, 'wb') as f:
+                f.write(content)
+            assert count_lines(fn) == count
+
+
+def test_grumble_to_curmudgeons():
+    assert grumble_to_curmudgeons(0.29) == 29
+    assert grumble_to_curmudgeons(1.15) == 115
+    assert grumble_to_curmudgeons(2) == 2 * CURMUDGEON_PER_GRUMBLE
+
+
+def test_human_bignum():
+    assert human_bignum(0) == '0.00'
+    assert human_bignum(999) == '999.00'
+    assert human_bignum(1000) == '1.00k'
+    assert human_bignum(123456.7) == '123.46k'
+    assert human_bignum(2_500_000) == '2.50M'
+    assert human_bignum(10 ** 30) == '1000000.00Y'
+
+
+@patch('cancelchain.command.TAIL_CHUNK_SIZE', 4)
+def test_read_last_line():
+    with TemporaryDirectory() as tmpdir:
+        fn = os.path.join(tmpdir, 'lines.txt')
+        for content, line in [
+            (b'', ''), (b'abc', 'abc'), (b'abc\n', 'abc\n'),
+            (b'a\nbcdefghij\n', 'bcdefghij\n'), (b'a\nbcdefghij', 'bcdefghij')
+        ]:
+            with open(fn, 'wb') as f:
+                f.write(content)
+            assert read_last_line(fn) == line
+
+
 def test_init(app, runner):
     with app.app_context():
         result = runner.invoke(args=['init'])
@@ -1,4 +1,12 @@
-from cancelchain.config import EnvAppSettings
+import pytest
+from cancelchain.cache import validate_cache_config
+from cancelchain.config import (
+    EnvAppSettings,
+    clear_env_config,
+    env_app_settings,
+    env_config,
+)
+from flask import Flask
 
 
 def test_environ_settings():
@@ -9,5 +17,37 @@ def test_environ_settings():
     ] == s.READER_ADDRESSES
 
 
+def test_cached_environ_settings(config_app):
+    assert env_app_settings() is env_app_settings()
+    assert config_app.config['READER_ADDRESSES'] == (
+        env_app_settings().READER_ADDRESSES
+    )
+    assert config_app.config['READER_ADDRESSES'] is not (
+        env_app_settings().READER_ADDRESSES
+    )
+
+
+def test_clear_env_config(monkeypatch):
+    config = env_config()
+    settings = env_app_settings()
+    assert env_config() is config
+    monkeypatch.setenv('CC_API_CLIENT_TIMEOUT', '42')
+    assert env_config() is config
+    clear_env_config()
+    assert env_app_settings() is not settings
+    assert env_config()['API_CLIENT_TIMEOUT'] == 42
+    monkeypatch.delenv('CC_API_CLIENT_TIMEOUT')
+    clear_env_config()
+
+
 def test_flask_config(config_app):
     assert config_app.config.get('SECRET_KEY') == 'testkey'
+
+
+def test_session_tokens_require_cache():
+    app = Flask(__name__)
+    app.config.update(API_SESSION_TOKENS=True, CACHE_TYPE='NullCache')
+    with pytest.raises(RuntimeError):
+        validate_cache_config(app)
+    app.config['CACHE_TYPE'] = 'SimpleCache'
+    validate_cache_config(app)
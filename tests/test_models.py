@@ -78,3 +78,30 @@ def test_unspent_outflows(app, subject, time_stepper, wallet):
         balance = int(1.5 * chain_a.block_reward())
         assert dao_a.wallet_balance(wallet.address) == balance
         assert dao_a.subject_balance(subject) == cb_1_amount
+
+
+def test_block_from_dao(app, wallet):
+    with app.app_context():
+        chain = Chain()
+        block = Block()
+        chain.link_block(block)
+        chain.seal_block(block, wallet)
+        block.mill()
+        chain.add_block(block)
+        chain.to_db()
+        db_block = Block.from_db(block.block_hash)
+        assert 'txns' not in db_block.__dict__
+        assert db_block.txns == block.txns
+        assert db_block.to_json() == block.to_json()
+
+
+def test_block_ancestors(add_chain_block, app):
+    with app.app_context():
+        chain, block_1 = add_chain_block()
+        _, block_2 = add_chain_block(chain=chain)
+        _, block_3 = add_chain_block(chain=chain)
+        dao = BlockDAO.get(block_3.block_hash)
+        assert [a.block_hash for a in dao.ancestors] == [
+            block_2.block_hash, block_1.block_hash
+        ]
+        assert list(chain.blocks) == [block_3, block_2, block_1]
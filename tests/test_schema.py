@@ -0,0 +1,25 @@
+import pytest
+from cancelchain.milling import mill_hash_str
+from cancelchain.schema import validate_base64, validate_mill_hash
+from cancelchain.wallet import b64encode
+
+
+@pytest.mark.parametrize('value', [
+    mill_hash_str('cancelchain'),
+    mill_hash_str('cancelchain').upper(),
+    b64encode(b'\x00' * 48),
+    b64encode(b'\xff' * 47),
+    b64encode(b'\xff' * 46),
+    'A' * 62 + 'B=',
+    'A' * 61 + 'B==',
+    'A' * 63,
+    'A' * 65,
+    'A' * 63 + '=',
+    'A' * 63 + '-',
+    'A' * 32 + ' ' + 'A' * 31,
+    '',
+])
+def test_validate_mill_hash(value):
+    assert validate_mill_hash(value) == (
+        len(value) == 64 and validate_base64(value)
+    )
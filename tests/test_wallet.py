@@ -1,4 +1,5 @@
 import logging
+import os
 
 import pytest
 from cancelchain.exceptions import InvalidKeyError
@@ -72,6 +73,23 @@ def test_file(tmp_path, wallet):
     assert w == wallet
 
 
+def test_file_cached(tmp_path, wallet):
+    f = wallet.to_file(walletdir=tmp_path)
+    w = Wallet.from_file(f)
+    assert Wallet.from_file(f) is w
+    new_wallet = Wallet()
+    with open(f'{f}.new', 'wb') as wf:
+        wf.write(new_wallet.export_private_key_pem())
+    os.replace(f'{f}.new', f)
+    assert Wallet.from_file(f) == new_wallet
+
+
+def test_file_passphrase_not_cached(tmp_path, wallet):
+    f = wallet.to_file(walletdir=tmp_path, passphrase=PASSPHRASE)
+    w = Wallet.from_file(f, passphrase=PASSPHRASE)
+    assert Wallet.from_file(f, passphrase=PASSPHRASE) is not w
+
+
 def test_file_passphrase(tmp_path, wallet):
     f = wallet.to_file(walletdir=tmp_path, passphrase=PASSPHRASE)
     with pytest.raises(InvalidKeyError):